@@ -13,8 +13,10 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import os
 import sys
-from pybuilder.core import Author, init, use_plugin
+from pybuilder.core import Author, init, task, use_plugin
+from pybuilder.core import description as task_description
 
 use_plugin('python.core')
 
@@ -55,6 +57,8 @@ def set_properties(project):
 
     project.set_property('coverage_break_build', True)
 
+    project.set_property('dir_source_benchmark_python', 'src/benchmark/python')
+
     project.set_property('copy_resources_target', '$dir_dist')
     project.get_property('copy_resources_glob').append('LICENSE.txt')
     project.get_property('copy_resources_glob').append('setup.cfg')
@@ -85,3 +89,20 @@ def set_properties(project):
     header = open('header.py').read()
     project.set_property('pybuilder_header_plugin_expected_header', header)
     project.set_property('pybuilder_header_plugin_break_build', True)
+
+
+@task
+@task_description('Runs the benchmarks and writes the results to $dir_reports/benchmarks.json')
+def benchmark(project, logger):
+    sys.path.insert(0, project.expand_path('$dir_source_main_python'))
+    sys.path.insert(0, project.expand_path('$dir_source_benchmark_python'))
+
+    import fluentmock_benchmarks
+
+    reports_directory = project.expand_path('$dir_reports')
+    if not os.path.exists(reports_directory):
+        os.makedirs(reports_directory)
+
+    output_file_name = os.path.join(reports_directory, 'benchmarks.json')
+    logger.info('Running benchmarks, results will be written to %s', output_file_name)
+    fluentmock_benchmarks.main([output_file_name])
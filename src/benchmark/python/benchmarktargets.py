@@ -0,0 +1,30 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Functions patched by the fluentmock benchmarks. """
+
+NUMBER_OF_FUNCTIONS = 100
+
+
+def _create_function(number):
+    def function(*arguments, **keyword_arguments):
+        return number
+
+    function.__name__ = 'function_%d' % number
+    return function
+
+
+for _number in range(NUMBER_OF_FUNCTIONS):
+    globals()['function_%d' % _number] = _create_function(_number)
@@ -0,0 +1,180 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Benchmarks for the hot paths of fluentmock.
+
+    Usage: python fluentmock_benchmarks.py [output.json]
+
+    Every benchmark is repeated and the fastest repetition is reported, so that
+    results of different fluentmock versions can be compared.
+"""
+
+import json
+import platform
+import sys
+
+from timeit import default_timer
+from unittest import TestCase
+
+import fluentmock
+from fluentmock import ANY_VALUE, ANY_VALUES, create_mock, undo_patches, verify, when
+from fluentmock.exceptions import VerificationError
+
+import benchmarktargets
+
+REPETITIONS = 5
+
+_benchmarks = []
+
+
+def benchmark(operations):
+    """ Registers the decorated function as benchmark performing the given number of operations. """
+    def register(function):
+        _benchmarks.append((function.__name__, operations, function))
+        return function
+    return register
+
+
+def _configure_literal_answers(number_of_answers):
+    answer = None
+    for identifier in range(number_of_answers):
+        answer = when(benchmarktargets).function_0(identifier).then_return(identifier)
+    return answer
+
+
+@benchmark(operations=10000)
+def configure_answers_with_then_return():
+    _configure_literal_answers(10000)
+
+
+@benchmark(operations=10000)
+def dispatch_with_1_answer():
+    _configure_literal_answers(1)
+    for _ in range(10000):
+        benchmarktargets.function_0(0)
+
+
+@benchmark(operations=10000)
+def dispatch_with_100_answers():
+    _configure_literal_answers(100)
+    for identifier in range(10000):
+        benchmarktargets.function_0(identifier % 100)
+
+
+@benchmark(operations=10000)
+def dispatch_with_10000_answers():
+    _configure_literal_answers(10000)
+    for identifier in range(10000):
+        benchmarktargets.function_0(identifier)
+
+
+@benchmark(operations=10000)
+def dispatch_with_100_matcher_answers():
+    for identifier in range(100):
+        when(benchmarktargets).function_0(identifier, ANY_VALUE).then_return(identifier)
+    for identifier in range(10000):
+        benchmarktargets.function_0(identifier % 100, 'value')
+
+
+@benchmark(operations=100000)
+def record_calls():
+    when(benchmarktargets).function_0(ANY_VALUES).then_return(0)
+    for identifier in range(100000):
+        benchmarktargets.function_0(identifier, keyword='value')
+
+
+@benchmark(operations=100)
+def verify_against_large_call_log():
+    for number in range(10):
+        when(benchmarktargets).__getattr__('function_%d' % number)(ANY_VALUES).then_return(number)
+    for identifier in range(50000):
+        getattr(benchmarktargets, 'function_%d' % (identifier % 10))(identifier % 100)
+    for identifier in range(100):
+        verify(benchmarktargets, times=500).function_0((identifier % 10) * 10)
+
+
+@benchmark(operations=benchmarktargets.NUMBER_OF_FUNCTIONS)
+def undo_patches_teardown():
+    for number in range(benchmarktargets.NUMBER_OF_FUNCTIONS):
+        when(benchmarktargets).__getattr__('function_%d' % number)(ANY_VALUES).then_return(number)
+    undo_patches()
+
+
+@benchmark(operations=10)
+def format_verification_error():
+    when(benchmarktargets).function_0(ANY_VALUES).then_return(0)
+    for identifier in range(10000):
+        benchmarktargets.function_0(identifier)
+    for _ in range(10):
+        try:
+            verify(benchmarktargets).function_0('never given')
+        except VerificationError as error:
+            str(error)
+
+
+@benchmark(operations=1000)
+def create_mocks_of_specification():
+    for _ in range(1000):
+        create_mock(TestCase, spam='eggs')
+
+
+def run_benchmark(function):
+    fastest = None
+    for _ in range(REPETITIONS):
+        started = default_timer()
+        try:
+            function()
+        finally:
+            elapsed = default_timer() - started
+            undo_patches()
+        if fastest is None or elapsed < fastest:
+            fastest = elapsed
+    return fastest
+
+
+def run_benchmarks():
+    results = []
+    for name, operations, function in _benchmarks:
+        seconds = run_benchmark(function)
+        results.append({
+            'name': name,
+            'operations': operations,
+            'seconds': seconds,
+            'operations_per_second': operations / seconds if seconds else None
+        })
+        sys.stdout.write('{name:<40} {seconds:>10.6f} s\n'.format(name=name, seconds=seconds))
+
+    return {
+        'fluentmock': fluentmock.__version__,
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'repetitions': REPETITIONS,
+        'benchmarks': results
+    }
+
+
+def main(arguments):
+    output_file_name = arguments[0] if arguments else 'fluentmock_benchmarks.json'
+
+    results = run_benchmarks()
+
+    with open(output_file_name, 'w') as output_file:
+        json.dump(results, output_file, indent=2, sort_keys=True)
+
+    sys.stdout.write('Results written to {0}\n'.format(output_file_name))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
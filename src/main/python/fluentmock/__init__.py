@@ -29,9 +29,24 @@ __all__ = [
     'ANY_VALUES',
     'AT_LEAST_ONCE',
     'NEVER',
+    'RECORD_ALL',
+    'RECORD_COUNTS',
+    'RECORD_NOTHING',
+    'RETAIN_ARGUMENTS',
+    'RETAIN_DIGESTS',
+    'RETAIN_WEAK_REFERENCES',
     'UnitTests',
     'create_mock',
+    'expect',
+    'mock_factory',
+    'record_last',
+    'scope',
+    'scoped',
+    'set_argument_retention',
+    'set_recording_policy',
     'verify',
+    'verify_all',
+    'verify_in_order',
     'when'
 ]
 
@@ -45,22 +60,53 @@ except ImportError as import_error:
     print('')
     print('Please install importlib using "pip install importlib".')
 
+try:
+    from contextvars import ContextVar
+except ImportError:
+    ContextVar = None
+
 from mock import Mock, call, patch
 
+from collections import deque
+from functools import wraps
+from itertools import count
 from logging import getLogger
+from threading import RLock, local
 from unittest import TestCase
+from weakref import WeakKeyDictionary
+import inspect
+import sys
 import types
 
-from fluentmock.exceptions import (InvalidAttributeError,
+from fluentmock.exceptions import (AggregatedVerificationError,
+                                   AutospecNotSupportedError,
+                                   CallsNotRetainedError,
+                                   ConflictingOptionsError,
+                                   InvalidAttributeError,
                                    InvalidUseOfAnyValuesError,
+                                   SignatureMismatchError,
                                    VerificationError)
+try:
+    from fluentmock.asynchronous import answer_when_awaited, scoped_coroutine_function
+except SyntaxError:
+    answer_when_awaited = None
+    scoped_coroutine_function = None
+
 from fluentmock.matchers import (AtLeastOnceMatcher,
                                  FluentMatcher,
                                  AnyValuesMatcher,
                                  AnyValueMatcher,
                                  AnyValueOfTypeMatcher,
                                  NeverMatcher,
-                                 TimesMatcher)
+                                 TimesMatcher,
+                                 values_differ)
+from fluentmock.retention import (RETAIN_ARGUMENTS,
+                                  RETAIN_DIGESTS,
+                                  RETAIN_WEAK_REFERENCES,
+                                  matches_recorded_argument,
+                                  may_have_matched_lost_arguments,
+                                  replayable_arguments)
+from fluentmock.signatures import callable_of_attribute, signature_of_callable, signatures_are_supported
 
 LOGGER = getLogger(__name__)
 
@@ -78,30 +124,63 @@ ANY_VALUES = AnyValuesMatcher()
 AT_LEAST_ONCE = AtLeastOnceMatcher()
 NEVER = NeverMatcher()
 
-NO_MATCHERS_IN_PURE_MOCK = """fluentmock.verify will look up the call_args_list of the
-          given mock for verification when the Mock has not been
-          configured using fluentmock.when! Therefore it is not
-          possible to use matchers when verifying a Mock without
-          configuring it with fluentmock.when, because Mock itself
-          does not support matchers.
+_resolved_modules = {}
+
+_CLASS_TYPES = (type, getattr(types, 'ClassType') if hasattr(types, 'ClassType') else type)
+
+
+if ContextVar is not None:
+    _active_registry = ContextVar('fluentmock_active_registry', default=None)
+
+    def _activate_registry(registry):
+        return _active_registry.set(registry)
 
-          Please configure your mock using fluentmock.when in order
-          to be able to use matchers!
-"""
+    def _deactivate_registry(token):
+        _active_registry.reset(token)
 
-_configurators = {}
-_patch_entries = []
-_call_entries = []
+    def _get_active_registry():
+        return _active_registry.get()
+else:
+    _thread_local_state = local()
+
+    def _activate_registry(registry):
+        previous_registry = getattr(_thread_local_state, 'registry', None)
+        _thread_local_state.registry = registry
+        return previous_registry
+
+    def _deactivate_registry(previous_registry):
+        _thread_local_state.registry = previous_registry
+
+    def _get_active_registry():
+        return getattr(_thread_local_state, 'registry', None)
 
 
 class UnitTests(TestCase):
 
+    _has_activated_registry = False
+    _registry_token = None
+
     def setUp(self):
-        self.set_up()
+        self._registry_token = _activate_registry(FluentRegistry(parent=get_registry()))
+        self._has_activated_registry = True
+        try:
+            self.set_up()
+        except BaseException:
+            self._release_registry()
+            raise
 
     def tearDown(self):
-        self.tear_down()
+        try:
+            self.tear_down()
+        finally:
+            self._release_registry()
+
+    def _release_registry(self):
+        """ Undoes the patches of the test, tolerating subclasses which override setUp without calling it. """
         undo_patches()
+        if self._has_activated_registry:
+            self._has_activated_registry = False
+            _deactivate_registry(self._registry_token)
 
     def set_up(self):
         """ Override this method to set up your unit test environment """
@@ -112,20 +191,36 @@ class UnitTests(TestCase):
         pass
 
 
+def _resolve_module(name, module=None):
+    """ Returns the imported module and the set of its attributes known to exist. A module which has been
+        reloaded or replaced in sys.modules since it has been resolved is resolved again. """
+    if module is None:
+        module = sys.modules.get(name)
+
+    resolved_module = _resolved_modules.get(name)
+    if resolved_module is None or resolved_module[0] is not module:
+        if module is None:
+            module = import_module(name)
+        resolved_module = _resolved_modules[name] = (module, set())
+    return resolved_module
+
+
+def _forget_resolved_modules():
+    _resolved_modules.clear()
+
+
 class FluentTarget(object):
 
     def __init__(self, target, attribute_name=None):
-        class_types = (type,
-                       getattr(types, 'ClassType')
-                       if hasattr(types, 'ClassType')
-                       else type)
+        known_attributes = None
+
         if isinstance(target, str):
             self.name = target
-            self.object = import_module(self.name)
+            self.object, known_attributes = _resolve_module(self.name)
         elif isinstance(target, types.ModuleType):
             self.name = target.__name__
-            self.object = import_module(self.name)
-        elif type(target) in class_types:
+            self.object, known_attributes = _resolve_module(self.name, target)
+        elif type(target) in _CLASS_TYPES:
             self.name = target.__module__ + '.' + target.__name__
             self.object = target
         else:
@@ -133,8 +228,12 @@ class FluentTarget(object):
             self.name = target_type.__module__ + '.' + target_type.__name__
             self.object = target
 
-        if attribute_name is not None and not hasattr(self.object, attribute_name):
-            raise InvalidAttributeError(self.name, attribute_name)
+        if attribute_name is not None:
+            if known_attributes is None or attribute_name not in known_attributes:
+                if not hasattr(self.object, attribute_name):
+                    raise InvalidAttributeError(self.name, attribute_name)
+                if known_attributes is not None:
+                    known_attributes.add(attribute_name)
 
         self.attribute_name = attribute_name
 
@@ -149,24 +248,143 @@ class FluentTarget(object):
         return self.full_qualified_target_name
 
 
+def _argument_signature(arguments, keyword_arguments):
+    if keyword_arguments:
+        signature = (arguments, tuple(sorted(keyword_arguments.items())))
+    else:
+        signature = (arguments, ())
+
+    try:
+        hash(signature)
+    except TypeError:
+        return None
+
+    return signature
+
+
+def _contains_matchers(arguments, keyword_arguments):
+    for argument in arguments:
+        if isinstance(argument, FluentMatcher):
+            return True
+
+    if keyword_arguments:
+        for value in keyword_arguments.values():
+            if isinstance(value, FluentMatcher):
+                return True
+
+    return False
+
+
+def _contains_any_values(arguments):
+    for argument in arguments:
+        if argument is ANY_VALUES:
+            return True
+    return False
+
+
+def _same_arguments(arguments, keyword_arguments, other_arguments, other_keyword_arguments):
+    try:
+        return arguments == other_arguments and keyword_arguments == other_keyword_arguments
+    except ValueError:
+        pass
+
+    # arrays can not be compared as part of a tuple, since their comparison results in an array
+    if len(arguments) != len(other_arguments) or set(keyword_arguments) != set(other_keyword_arguments):
+        return False
+
+    for argument, other_argument in zip(arguments, other_arguments):
+        if values_differ(argument, other_argument):
+            return False
+
+    for key, value in keyword_arguments.items():
+        if values_differ(value, other_keyword_arguments[key]):
+            return False
+
+    return True
+
+
+def _hashable_signature(arguments, keyword_arguments):
+    if _contains_matchers(arguments, keyword_arguments):
+        return None
+
+    return _argument_signature(arguments, keyword_arguments)
+
+
+_NOT_COMPUTED = object()
+_NOT_SET = object()
+
+
 class FluentCallEntry(object):
 
+    __slots__ = ('target', 'arguments', 'keyword_arguments', '_signature', '_signature_hash', '_contains_matchers')
+
     def __init__(self, target, attribute_name, arguments, keyword_arguments):
         self.target = FluentTarget(target, attribute_name)
         self.arguments = arguments
         self.keyword_arguments = keyword_arguments
+        self._signature = _NOT_COMPUTED
+        self._signature_hash = None
+        self._contains_matchers = None
+
+    @classmethod
+    def of_resolved_target(cls, fluent_target, arguments, keyword_arguments, signature=_NOT_COMPUTED):
+        """ Creates a call entry reusing an already resolved FluentTarget and, if known, its hashable signature. """
+        call_entry = cls.__new__(cls)
+        call_entry.target = fluent_target
+        call_entry.arguments = arguments
+        call_entry.keyword_arguments = keyword_arguments
+        call_entry._signature = signature
+        call_entry._signature_hash = None
+        call_entry._contains_matchers = False if signature is not None and signature is not _NOT_COMPUTED else None
+        return call_entry
+
+    def _get_signature(self):
+        if self._signature is _NOT_COMPUTED:
+            self._signature = _hashable_signature(self.arguments, self.keyword_arguments)
+            if self._signature is not None:
+                self._contains_matchers = False
+        return self._signature
+
+    def _get_signature_hash(self):
+        if self._signature_hash is None:
+            self._signature_hash = hash(self._signature)
+        return self._signature_hash
+
+    def _has_matchers(self):
+        if self._contains_matchers is None:
+            self._contains_matchers = _contains_matchers(self.arguments, self.keyword_arguments)
+        return self._contains_matchers
 
     def matches(self, target, attribute_name, arguments, keyword_arguments):
         if not self.target.is_equal_to(target, attribute_name):
             return False
 
+        return self._matches_arguments(arguments, keyword_arguments)
+
+    def matches_arguments_of(self, call_entry):
+        """ Matches the arguments of another call entry of the same target using the signatures of both entries. """
+        signature = self._get_signature()
+        other_signature = call_entry._get_signature()
+
+        if signature is not None and other_signature is not None:
+            if self._get_signature_hash() != call_entry._get_signature_hash():
+                return False
+            return signature == other_signature
+
+        if not self._has_matchers() and not call_entry._has_matchers():
+            return _same_arguments(self.arguments, self.keyword_arguments,
+                                   call_entry.arguments, call_entry.keyword_arguments)
+
+        return self._matches_arguments(call_entry.arguments, call_entry.keyword_arguments)
+
+    def _matches_arguments(self, arguments, keyword_arguments):
         if self.arguments and self.arguments[0] is ANY_VALUES:
             return True
 
         if arguments and arguments[0] is ANY_VALUES:
             return True
 
-        if self.arguments == arguments and self.keyword_arguments == keyword_arguments:
+        if _same_arguments(self.arguments, self.keyword_arguments, arguments, keyword_arguments):
             return True
 
         if len(self.arguments) != len(arguments):
@@ -181,9 +399,9 @@ class FluentCallEntry(object):
                 if not value.matches(argument):
                     return False
             elif isinstance(argument, FluentMatcher):
-                if not argument.matches(value):
+                if not matches_recorded_argument(argument, value):
                     return False
-            elif value != argument:
+            elif values_differ(value, argument):
                 return False
 
         if len(self.keyword_arguments) > 0:
@@ -196,9 +414,9 @@ class FluentCallEntry(object):
                     if not self.keyword_arguments[key].matches(keyword_arguments[key]):
                         return False
                 elif isinstance(keyword_arguments[key], FluentMatcher):
-                    if not keyword_arguments[key].matches(self.keyword_arguments[key]):
+                    if not matches_recorded_argument(keyword_arguments[key], self.keyword_arguments[key]):
                         return False
-                elif self.keyword_arguments[key] != keyword_arguments[key]:
+                elif values_differ(self.keyword_arguments[key], keyword_arguments[key]):
                     return False
 
         return True
@@ -209,6 +427,168 @@ class FluentCallEntry(object):
         return call_string[:4] + ' ' + str(self.target) + call_string[4:]
 
 
+def _argument_predicate(expected):
+    if isinstance(expected, FluentMatcher):
+        return expected.matches
+
+    def is_equal_to_expected(argument):
+        return not values_differ(expected, argument)
+
+    return is_equal_to_expected
+
+
+class RecordingPolicy(object):
+    """ Decides which data of the calls to a patched function is retained for verification. """
+
+    def __init__(self, description, keeps_calls, keeps_counts, maximum_number_of_calls=None):
+        self.description = description
+        self.keeps_calls = keeps_calls
+        self.keeps_counts = keeps_counts
+        self.maximum_number_of_calls = maximum_number_of_calls
+
+    def __repr__(self):
+        return self.description
+
+
+RECORD_ALL = RecordingPolicy('all calls', keeps_calls=True, keeps_counts=True)
+RECORD_COUNTS = RecordingPolicy('counts per argument signature', keeps_calls=False, keeps_counts=True)
+RECORD_NOTHING = RecordingPolicy('the number of calls', keeps_calls=False, keeps_counts=False)
+
+
+def record_last(number_of_calls):
+    """ Returns a recording policy which retains the given number of most recent calls. """
+    description = 'the last {number} calls'.format(number=number_of_calls)
+    return RecordingPolicy(description, keeps_calls=True, keeps_counts=False, maximum_number_of_calls=number_of_calls)
+
+
+class FluentCallIndex(object):
+    """ Collects the calls of a single patched target attribute.
+
+        Calls with hashable arguments are additionally counted per argument
+        signature, so that verifying literal values is a dictionary lookup.
+        The recording policy decides which of this data is retained.
+    """
+
+    def __init__(self, recording_policy=RECORD_ALL, argument_retention=RETAIN_ARGUMENTS):
+        self.recording_policy = recording_policy
+        self.number_of_calls = 0
+        self._keeps_weak_references = argument_retention is RETAIN_WEAK_REFERENCES
+
+        if recording_policy.maximum_number_of_calls is not None:
+            self.call_entries = deque(maxlen=recording_policy.maximum_number_of_calls)
+        else:
+            self.call_entries = []
+
+        self._counts_by_signature = {}
+        self._number_of_counted_calls = 0
+        self._unhashable_call_entries = []
+        # call entries of counted signatures which retain weak references, by the hash of their signature
+        self._weakly_counted_call_entries = {}
+
+    def add(self, call_entry, signature):
+        recording_policy = self.recording_policy
+        self.number_of_calls += 1
+
+        if recording_policy.keeps_calls:
+            self.call_entries.append(call_entry)
+
+        if recording_policy.keeps_counts:
+            if signature is not None:
+                count = self._counts_by_signature.get(signature, 0)
+                if count == 0 and self._keeps_weak_references:
+                    self._weakly_counted_call_entries.setdefault(hash(signature), []).append(call_entry)
+                self._counts_by_signature[signature] = count + 1
+                self._number_of_counted_calls += 1
+            elif recording_policy.keeps_calls:
+                self._unhashable_call_entries.append(call_entry)
+
+    def count_matching(self, expected_call_entry):
+        arguments = expected_call_entry.arguments
+        if arguments and arguments[0] is ANY_VALUES:
+            return self.number_of_calls
+
+        recording_policy = self.recording_policy
+        signature = expected_call_entry._get_signature()
+
+        if signature is not None and recording_policy.keeps_counts:
+            call_entries = self._unhashable_call_entries
+            matching_call_entries = self._counts_by_signature.get(signature, 0)
+            if self._keeps_weak_references:
+                self._ensure_no_lost_arguments(self._weakly_counted_call_entries.get(hash(signature), ()),
+                                               expected_call_entry)
+        elif recording_policy.keeps_calls and len(self.call_entries) == self.number_of_calls:
+            call_entries = self.call_entries
+            matching_call_entries = 0
+        elif recording_policy.keeps_counts and self._number_of_counted_calls == self.number_of_calls:
+            return self._count_matching_signatures(expected_call_entry)
+        else:
+            raise CallsNotRetainedError(recording_policy)
+
+        for call_entry in call_entries:
+            if call_entry.matches_arguments_of(expected_call_entry):
+                matching_call_entries += 1
+            elif self._keeps_weak_references and not expected_call_entry._has_matchers():
+                self._ensure_no_lost_arguments((call_entry,), expected_call_entry)
+
+        return matching_call_entries
+
+    def _count_matching_signatures(self, expected_call_entry):
+        """ Matches the expected call entry, e.g. containing matchers, against each distinct counted signature. """
+        matching_call_entries = 0
+
+        for signature, number_of_calls in self._counts_by_signature.items():
+            arguments, keyword_items = signature
+            call_entry = FluentCallEntry.of_resolved_target(None, arguments, dict(keyword_items), signature)
+            if call_entry.matches_arguments_of(expected_call_entry):
+                matching_call_entries += number_of_calls
+
+        return matching_call_entries
+
+    @staticmethod
+    def _ensure_no_lost_arguments(call_entries, expected_call_entry):
+        """ Raises a CallsNotRetainedError if garbage collected arguments of the given call entries might have been
+            equal to the expected arguments, since the number of matching calls is not known then. """
+        for call_entry in call_entries:
+            if may_have_matched_lost_arguments(call_entry.arguments, call_entry.keyword_arguments,
+                                               expected_call_entry.arguments, expected_call_entry.keyword_arguments):
+                raise CallsNotRetainedError(RETAIN_WEAK_REFERENCES)
+
+
+class MockCallIndex(object):
+    """ Indexes the call_args_list of a method of a plain Mock, adding only the calls made since the last count. """
+
+    def __init__(self):
+        self._call_args_list = None
+        self._call_index = None
+
+    def count_matching(self, method_of_mock, expected_call_entry):
+        call_args_list = method_of_mock.call_args_list
+
+        if call_args_list is not self._call_args_list or len(call_args_list) < self._call_index.number_of_calls:
+            self._call_args_list = call_args_list
+            self._call_index = FluentCallIndex(RECORD_ALL)
+
+        call_index = self._call_index
+        for arguments, keyword_arguments in call_args_list[call_index.number_of_calls:]:
+            # the entries have no target, which would keep the mock alive as long as the index
+            call_entry = FluentCallEntry.of_resolved_target(None, arguments, keyword_arguments)
+            call_index.add(call_entry, call_entry._get_signature())
+
+        return call_index.count_matching(expected_call_entry)
+
+
+_mock_call_indexes = WeakKeyDictionary()
+_mock_call_indexes_lock = RLock()
+
+
+def _count_matching_calls_of_mock(method_of_mock, expected_call_entry):
+    with _mock_call_indexes_lock:
+        mock_call_index = _mock_call_indexes.get(method_of_mock)
+        if mock_call_index is None:
+            mock_call_index = _mock_call_indexes[method_of_mock] = MockCallIndex()
+        return mock_call_index.count_matching(method_of_mock, expected_call_entry)
+
+
 class FluentAnswer(FluentCallEntry):
 
     class AnswerByReturning(object):
@@ -227,36 +607,147 @@ class FluentAnswer(FluentCallEntry):
         def __call__(self):
             raise self._value
 
+    class AnswerByAwaiting(object):
+
+        is_awaited = True
+
+        def __init__(self, awaitable):
+            self._awaitable = awaitable
+
+        def __call__(self):
+            if callable(self._awaitable):
+                return self._awaitable()
+            return self._awaitable
+
+    class AnswerByDelaying(object):
+
+        is_awaited = True
+
+        def __init__(self, seconds, value):
+            self._seconds = seconds
+            self._value = value
+
+        def __call__(self):
+            import asyncio
+            return asyncio.sleep(self._seconds, result=self._value)
+
+    class AnswerByIterating(object):
+
+        def __init__(self, values):
+            self._values = iter(values)
+            self._last_answer = None
+
+        def advance(self):
+            """ Returns False when there are no values left to answer with. """
+            for value in self._values:
+                self._last_answer = value
+                return True
+            return False
+
+        def __call__(self):
+            return self._last_answer
+
     def __init__(self, target, attribute_name, arguments, keyword_arguments):
         FluentCallEntry.__init__(self, target, attribute_name, arguments, keyword_arguments)
         self.arguments = arguments
         self.keyword_arguments = keyword_arguments
-        self._answers = []
+        self._answers = deque()
+        self._previous_answer = None
+
+        # the key of the answer includes matchers, the signature of the call entry only literal values
+        self.answer_key = _argument_signature(arguments, keyword_arguments)
+        self._contains_matchers = _contains_matchers(arguments, keyword_arguments)
+        self._signature = None if self._contains_matchers else self.answer_key
+
+        self._matches_any_values = bool(arguments) and arguments[0] is ANY_VALUES
+        self._argument_predicates = [_argument_predicate(argument) for argument in arguments]
+        self._keyword_argument_predicates = [(key, _argument_predicate(value))
+                                             for key, value in keyword_arguments.items()]
+
+    def matches_call(self, arguments, keyword_arguments):
+        """ Matches the arguments of a call to the patched target, which must not contain matchers. """
+        if self._matches_any_values:
+            return True
+
+        if len(arguments) != len(self._argument_predicates):
+            return False
+
+        if len(keyword_arguments) != len(self._keyword_argument_predicates):
+            return False
+
+        for predicate, argument in zip(self._argument_predicates, arguments):
+            if not predicate(argument):
+                return False
+
+        for key, predicate in self._keyword_argument_predicates:
+            if key not in keyword_arguments or not predicate(keyword_arguments[key]):
+                return False
+
+        return True
 
     def next(self):
-        if len(self._answers) == 0:
+        answer = self.next_answer()
+        if answer is None:
             return None
-        elif len(self._answers) == 1:
-            answer = self._answers[0]
-        else:
-            answer = self._answers.pop(0)
 
         return answer()
 
+    def next_answer(self):
+        """ Consumes the next answer without answering, e.g. to answer when a call is awaited. """
+        answers = self._answers
+
+        while answers and isinstance(answers[0], self.AnswerByIterating):
+            if answers[0].advance():
+                self._previous_answer = self.AnswerByReturning(answers[0]())
+                return self._previous_answer
+            if len(answers) == 1 and self._previous_answer is None:
+                # the only answer has no values at all
+                return self.AnswerByReturning(None)
+            answers.popleft()
+
+        if len(answers) == 0:
+            return self._previous_answer
+        elif len(answers) == 1:
+            self._previous_answer = answers[0]
+        else:
+            self._previous_answer = answers.popleft()
+
+        return self._previous_answer
+
     def then_return(self, value):
         answer = self.AnswerByReturning(value)
         self._answers.append(answer)
         return self
 
+    def then_return_each(self, values):
+        """ Answers with the given values one after another, consuming them lazily. """
+        answer = self.AnswerByIterating(values)
+        self._answers.append(answer)
+        return self
+
     def then_raise(self, value):
         answer = self.AnswerByRaising(value)
         self._answers.append(answer)
         return self
 
+    def then_await(self, awaitable):
+        """ Answers a call to a coroutine function with the result of the given awaitable
+            or coroutine function. """
+        answer = self.AnswerByAwaiting(awaitable)
+        self._answers.append(answer)
+        return self
+
+    def then_delay(self, seconds, value=None):
+        """ Answers a call to a coroutine function with the given value after sleeping
+            the given seconds on the event loop. """
+        answer = self.AnswerByDelaying(seconds, value)
+        self._answers.append(answer)
+        return self
+
     def __eq__(self, other):
         if not isinstance(other, FluentAnswer):
             return False
-        return self.arguments == other.arguments and self.keyword_arguments == other.keyword_arguments
+        return _same_arguments(self.arguments, self.keyword_arguments, other.arguments, other.keyword_arguments)
 
 
 class FluentPatchEntry(object):
@@ -265,43 +756,191 @@ class FluentPatchEntry(object):
         self.target = FluentTarget(target, attribute_name)
 
         self._patch = None
+        self._patches_mock = False
+        self._replaced_attribute_of_mock = _NOT_SET
 
     def patch_away_with(self, fluent_mock):
         if isinstance(self.target.object, Mock):
+            attributes_of_mock = vars(self.target.object)
+            self._patches_mock = True
+            self._replaced_attribute_of_mock = attributes_of_mock.get(self.target.attribute_name, _NOT_SET)
             setattr(self.target.object, self.target.attribute_name, fluent_mock)
         else:
-            self._patch = patch(self.target.full_qualified_target_name)
-            mock = self._patch.__enter__()
-            mock.side_effect = fluent_mock
+            self._patch = patch(self.target.full_qualified_target_name, new=fluent_mock)
+            self._patch.__enter__()
 
     def undo(self):
         if self._patch:
             self._patch.__exit__()
+        elif self._patches_mock:
+            if self._replaced_attribute_of_mock is _NOT_SET:
+                vars(self.target.object).pop(self.target.attribute_name, None)
+            else:
+                setattr(self.target.object, self.target.attribute_name, self._replaced_attribute_of_mock)
 
 
 class FluentMock(FluentTarget):
 
-    def __init__(self, target, attribute_name):
+    def __init__(self, target, attribute_name, registry, recording_policy=RECORD_ALL,
+                 argument_retention=RETAIN_ARGUMENTS, autospec=False, normalize=False):
         FluentTarget.__init__(self, target, attribute_name)
-        self._answers = []
+        self._registry = registry
+        self.recording_policy = recording_policy
+        self.argument_retention = argument_retention
+        self.validates_arguments = autospec
+        self.normalizes_arguments = autospec or normalize
+
+        original = getattr(self.object, attribute_name)
+        if isinstance(original, FluentMock):
+            # patched again within an inner scope, the mock of the outer scope knows the patched callable
+            # and answers the calls which are not answered within the inner scope
+            self._outer_mock = original
+            self.original_callable = original.original_callable
+            self._drops_first_parameter = original._drops_first_parameter
+            self._is_coroutine_function = original._is_coroutine_function
+        else:
+            self._outer_mock = None
+            self.original_callable, self._drops_first_parameter = callable_of_attribute(self.object, attribute_name,
+                                                                                        original)
+            self._is_coroutine_function = _is_coroutine_function(original)
+
+        if autospec and not signatures_are_supported():
+            raise AutospecNotSupportedError(self.full_qualified_target_name)
+
+        if autospec or normalize:
+            self.target_signature = signature_of_callable(self.original_callable, self._drops_first_parameter)
+        else:
+            self.target_signature = None
+        self._positions = count()
+        self._literal_answers = {}
+        self._matcher_answers = {}
+        self._unhashable_answers = []
+        self._matcher_chain = None
+        self._answers_in_order = None
+
+    def ensure_options(self, recording_policy, argument_retention, autospec, normalize):
+        """ Raises a ConflictingOptionsError if the given options differ from the ones this mock has been patched
+            with. Options which are not given (None or False) do not conflict. """
+        target_name = self.full_qualified_target_name
+        if recording_policy is not None and recording_policy.description != self.recording_policy.description:
+            raise ConflictingOptionsError(target_name, 'recording', self.recording_policy, recording_policy)
+        if argument_retention is not None and argument_retention is not self.argument_retention:
+            raise ConflictingOptionsError(target_name, 'retention', self.argument_retention, argument_retention)
+        if autospec and not self.validates_arguments:
+            raise ConflictingOptionsError(target_name, 'autospec', False, True)
+        if normalize and not self.normalizes_arguments:
+            raise ConflictingOptionsError(target_name, 'normalize', False, True)
+
+    def canonical_arguments(self, arguments, keyword_arguments):
+        """ Binds the arguments to the signature of the patched callable, if patched with autospec or normalize.
+            Arguments which do not bind are an error with autospec and are kept as given with normalize. """
+        target_signature = self.target_signature
+        if target_signature is None or (arguments and arguments[0] is ANY_VALUES):
+            return arguments, keyword_arguments
+
+        try:
+            return target_signature.canonical_arguments(arguments, keyword_arguments)
+        except TypeError as error:
+            if not self.validates_arguments:
+                return arguments, keyword_arguments
+            call_string = str(call(*arguments, **keyword_arguments))[4:]
+            raise SignatureMismatchError(self.full_qualified_target_name, target_signature, call_string, str(error))
 
     def __call__(self, *arguments, **keyword_arguments):
-        call_entry = FluentCallEntry(self.object, self.attribute_name, arguments, keyword_arguments)
-        _call_entries.append(call_entry)
+        if self.target_signature is not None:
+            arguments, keyword_arguments = self.canonical_arguments(arguments, keyword_arguments)
+
+        if self.argument_retention is RETAIN_ARGUMENTS:
+            arguments, keyword_arguments = replayable_arguments(arguments, keyword_arguments)
+            signature = _hashable_signature(arguments, keyword_arguments)
+            call_entry = FluentCallEntry.of_resolved_target(self, arguments, keyword_arguments, signature)
+            recorded_signature = signature
+        else:
+            captured_arguments, captured_keyword_arguments = self.argument_retention.capture(arguments,
+                                                                                             keyword_arguments)
+            recorded_signature = _hashable_signature(captured_arguments, captured_keyword_arguments)
+            call_entry = FluentCallEntry.of_resolved_target(self, captured_arguments, captured_keyword_arguments,
+                                                            recorded_signature)
+            arguments, keyword_arguments = replayable_arguments(arguments, keyword_arguments)
+            signature = _hashable_signature(arguments, keyword_arguments)
+
+        with self._registry.lock:
+            self._registry.record_call(call_entry, recorded_signature)
+
+            answer = self._find_answer(signature, arguments, keyword_arguments)
+            if answer is None and self._outer_mock is not None:
+                answer = self._outer_mock._find_answer_within_scopes(signature, arguments, keyword_arguments)
+
+            if self._is_coroutine_function:
+                next_answer = answer.next_answer() if answer is not None else None
+                return answer_when_awaited(self._registry, call_entry, recorded_signature, next_answer)
+
+            if answer is None:
+                return None
+
+            return answer.next()
+
+    def _find_answer(self, signature, arguments, keyword_arguments):
+        if signature is None:
+            for position, answer in self._get_answers_in_order():
+                if answer.matches(self.object, self.attribute_name, arguments, keyword_arguments):
+                    return answer
+            return None
 
-        for answer in self._answers:
-            if answer.matches(self.object, self.attribute_name, arguments, keyword_arguments):
-                return answer.next()
+        literal_position, literal_answer = self._literal_answers.get(signature, (None, None))
 
-        return None
+        for position, answer in self._get_matcher_chain():
+            if literal_position is not None and position > literal_position:
+                break
+            if answer.matches_call(arguments, keyword_arguments):
+                return answer
+
+        return literal_answer
+
+    def _find_answer_within_scopes(self, signature, arguments, keyword_arguments):
+        """ Finds the answer of this mock or, if none matches, of the mocks of the outer scopes. """
+        with self._registry.lock:
+            answer = self._find_answer(signature, arguments, keyword_arguments)
+        if answer is None and self._outer_mock is not None:
+            return self._outer_mock._find_answer_within_scopes(signature, arguments, keyword_arguments)
+        return answer
+
+    def _get_matcher_chain(self):
+        if self._matcher_chain is None:
+            self._matcher_chain = sorted(list(self._matcher_answers.values()) + self._unhashable_answers,
+                                         key=_position_of_answer)
+        return self._matcher_chain
+
+    def _get_answers_in_order(self):
+        if self._answers_in_order is None:
+            self._answers_in_order = sorted(list(self._literal_answers.values()) + self._get_matcher_chain(),
+                                            key=_position_of_answer)
+        return self._answers_in_order
 
     def append_new_answer(self, new_answer):
+        with self._registry.lock:
+            self._append_new_answer(new_answer)
+
+    def _append_new_answer(self, new_answer):
+        positioned_answer = (next(self._positions), new_answer)
+        answer_key = new_answer.answer_key
+
+        if answer_key is None:
+            self._unhashable_answers = [(position, answer) for position, answer in self._unhashable_answers
+                                        if not answer == new_answer]
+            self._unhashable_answers.append(positioned_answer)
+            self._matcher_chain = None
+        elif new_answer._has_matchers():
+            self._matcher_answers[answer_key] = positioned_answer
+            self._matcher_chain = None
+        else:
+            self._literal_answers[answer_key] = positioned_answer
+
+        self._answers_in_order = None
 
-        for answer in self._answers:
-            if answer == new_answer:
-                self._answers.remove(answer)
 
-        self._answers.append(new_answer)
+def _position_of_answer(positioned_answer):
+    return positioned_answer[0]
 
 
 class FluentMockConfigurator(object):
@@ -309,10 +948,19 @@ class FluentMockConfigurator(object):
     def __init__(self, fluent_mock):
         self._fluent_mock = fluent_mock
 
+    @property
+    def recording_policy(self):
+        return self._fluent_mock.recording_policy
+
+    def canonical_arguments(self, arguments, keyword_arguments):
+        return self._fluent_mock.canonical_arguments(arguments, keyword_arguments)
+
     def __call__(self, *arguments, **keyword_arguments):
-        if len(arguments) > 1 and ANY_VALUES in arguments:
+        if len(arguments) > 1 and _contains_any_values(arguments):
             raise InvalidUseOfAnyValuesError()
 
+        arguments, keyword_arguments = self._fluent_mock.canonical_arguments(arguments, keyword_arguments)
+
         answer = FluentAnswer(self._fluent_mock.object, self._fluent_mock.attribute_name, arguments, keyword_arguments)
         self._fluent_mock.append_new_answer(answer)
         return answer
@@ -320,27 +968,169 @@ class FluentMockConfigurator(object):
 
 class FluentWhen(FluentTarget):
 
-    def __init__(self, target):
+    def __init__(self, target, recording_policy=None, argument_retention=None, autospec=False, normalize=False):
         FluentTarget.__init__(self, target)
+        self._recording_policy = recording_policy
+        self._argument_retention = argument_retention
+        self._autospec = autospec
+        self._normalize = normalize
 
     def __getattr__(self, attribute_name):
-        patch_entry = FluentPatchEntry(self.object, attribute_name)
-        _patch_entries.append(patch_entry)
+        return get_registry().get_configurator(self.object, attribute_name, self._recording_policy,
+                                               self._argument_retention, self._autospec, self._normalize)
+
+
+class FluentRegistry(object):
+    """ Holds the patches, configurators and recorded calls of a test.
+
+        Every registry guards its state with a lock, so calls recorded from
+        worker threads of the code under test can not race with verify.
+        A FluentMock records its calls in the registry it was created in,
+        no matter which thread or task calls it.
+    """
+
+    def __init__(self, parent=None):
+        self.lock = RLock()
+        self.parent = parent
+        self.configurators = {}
+        self.patch_entries = []
+        self.call_entries = []
+        self.number_of_calls = 0
+        self.call_index = {}
+        self.await_index = {}
+        self.recording_policy = RECORD_ALL if parent is None else parent.recording_policy
+        self.argument_retention = RETAIN_ARGUMENTS if parent is None else parent.argument_retention
+
+    def get_configurator(self, target, attribute_name, recording_policy=None, argument_retention=None,
+                         autospec=False, normalize=False):
+        """ Returns the configurator of the given attribute and patches it on first use.
+
+            The recording policy, argument retention, autospec and normalize are chosen when
+            the attribute is patched; the first two default to the ones of this registry.
+            Giving other options for an attribute which is already patched is an error.
+        """
+        configurator_key = (target, attribute_name)
+
+        with self.lock:
+            if configurator_key not in self.configurators:
+                fluent_mock = FluentMock(target, attribute_name, self,
+                                         recording_policy or self.recording_policy,
+                                         argument_retention or self.argument_retention,
+                                         autospec, normalize)
+
+                patch_entry = FluentPatchEntry(target, attribute_name)
+                self.patch_entries.append(patch_entry)
+                mock_configurator = FluentMockConfigurator(fluent_mock)
+                patch_entry.patch_away_with(fluent_mock)
+                self.configurators[configurator_key] = mock_configurator
+                return mock_configurator
+
+            mock_configurator = self.configurators[configurator_key]
+            if recording_policy or argument_retention or autospec or normalize:
+                mock_configurator._fluent_mock.ensure_options(recording_policy, argument_retention, autospec,
+                                                              normalize)
+            return mock_configurator
+
+    def record_call(self, call_entry, signature):
+        with self.lock:
+            self.number_of_calls += 1
+            if call_entry.target.recording_policy is RECORD_ALL:
+                self.call_entries.append(call_entry)
+            self._add_to_index(self.call_index, call_entry, signature)
+
+    def record_await(self, call_entry, signature):
+        with self.lock:
+            self._add_to_index(self.await_index, call_entry, signature)
+
+    def _add_to_index(self, index, call_entry, signature):
+        target = call_entry.target
+        index_key = (target.object, target.attribute_name)
+
+        call_index = index.get(index_key)
+        if call_index is None:
+            call_index = index[index_key] = FluentCallIndex(target.recording_policy, target.argument_retention)
+        call_index.add(call_entry, signature)
+
+    def count_matching_calls(self, expected_call_entry, awaited=False):
+        index = self.await_index if awaited else self.call_index
+        target = expected_call_entry.target
+
+        with self.lock:
+            call_index = index.get((target.object, target.attribute_name))
+            if call_index is None:
+                return 0
+            return call_index.count_matching(expected_call_entry)
+
+    def get_calls(self, target, attribute_name, awaited=False):
+        index = self.await_index if awaited else self.call_index
+
+        with self.lock:
+            call_index = index.get((target, attribute_name))
+            return list(call_index.call_entries) if call_index is not None else []
+
+    def get_owning_registry(self, target, attribute_name):
+        """ Returns this registry or the closest outer registry which has patched the given attribute. """
+        configurator_key = (target, attribute_name)
+        registry = self
+        while registry is not None:
+            if configurator_key in registry.configurators:
+                return registry
+            registry = registry.parent
+        return self
+
+    def canonical_arguments(self, target, attribute_name, arguments, keyword_arguments):
+        """ Returns the arguments in the canonical form of the patched attribute, e.g. to verify its calls. """
+        configurator = self.configurators.get((target, attribute_name))
+        if configurator is None:
+            return arguments, keyword_arguments
+        return configurator.canonical_arguments(arguments, keyword_arguments)
+
+    def get_recording_policy(self, target, attribute_name):
+        configurator = self.configurators.get((target, attribute_name))
+        if configurator is None:
+            return None
+        return configurator.recording_policy
+
+    def has_calls(self):
+        return self.number_of_calls > 0
 
-        configurator_key = (self.object, attribute_name)
-        if configurator_key not in _configurators:
-            fluent_mock = FluentMock(self.object, attribute_name)
-            mock_configurator = FluentMockConfigurator(fluent_mock)
-            patch_entry.patch_away_with(fluent_mock)
-            _configurators[configurator_key] = mock_configurator
+    def undo(self):
+        with self.lock:
+            for patch_entry in reversed(self.patch_entries):
+                patch_entry.undo()
+
+            self.configurators = {}
+            self.patch_entries = []
+            self.call_entries = []
+            _forget_resolved_modules()
+            self.number_of_calls = 0
+            self.call_index = {}
+            self.await_index = {}
+
+
+_default_registry = FluentRegistry()
 
-        return _configurators[configurator_key]
+
+class MethodCallOfMock(object):
+    """ A call recorded by a Mock, which is only turned into a string when a failed verification is shown. """
+
+    __slots__ = ('_mock_name', '_method_call')
+
+    def __init__(self, mock_name, method_call):
+        self._mock_name = mock_name
+        self._method_call = method_call
+
+    def __repr__(self):
+        actual_call_address = 'call ' + self._mock_name
+        return str(self._method_call).replace('call', actual_call_address)
 
 
 class Verifier(FluentTarget):
 
     def __init__(self, target, times):
         FluentTarget.__init__(self, target)
+        self._active_registry = get_registry()
+        self._registry = self._active_registry
 
         if isinstance(times, int):
             times = TimesMatcher(times)
@@ -358,72 +1148,255 @@ class Verifier(FluentTarget):
         if not hasattr(self.object, attribute_name):
             raise InvalidAttributeError(self.name, attribute_name)
 
+        self._registry = self._active_registry.get_owning_registry(self.object, attribute_name)
         return self
 
-    def _ensure_no_matchers_in_arguments(self, arguments, keyword_arguments):
-        call_entry = call(*arguments, **keyword_arguments)
-        call_entry_string = str(call_entry).replace('call', self.full_qualified_target_name)
-
-        for argument in arguments:
-            if isinstance(argument, FluentMatcher):
-                raise VerificationError(call_entry_string, self._matcher, reason=NO_MATCHERS_IN_PURE_MOCK)
-        for key in keyword_arguments:
-            if isinstance(keyword_arguments[key], FluentMatcher):
-                raise VerificationError(call_entry_string, self._matcher, reason=NO_MATCHERS_IN_PURE_MOCK)
-
     def _count_matching_call_entries(self, arguments, keyword_arguments):
-        matching_call_entries = 0
         method_of_mock = getattr(self.object, self.attribute_name)
+        expected_call_entry = FluentCallEntry(self.object, self.attribute_name, arguments, keyword_arguments)
 
         if isinstance(self.object, Mock) and isinstance(method_of_mock, Mock):
-            self._ensure_no_matchers_in_arguments(arguments, keyword_arguments)
+            return _count_matching_calls_of_mock(method_of_mock, expected_call_entry)
 
-            call_entry = call(*arguments, **keyword_arguments)
-            matching_call_entries = method_of_mock.call_args_list.count(call_entry)
-        else:
-            for call_entry in _call_entries:
-                if call_entry.matches(self.object, self.attribute_name, arguments, keyword_arguments):
-                    matching_call_entries += 1
-
-        return matching_call_entries
+        return self._registry.count_matching_calls(expected_call_entry)
 
     def _ensure_valid_usage_of_any_arguments(self, arguments):
-        if arguments and ANY_VALUES in arguments:
+        if arguments and _contains_any_values(arguments):
             if len(arguments) > 1:
                 raise InvalidUseOfAnyValuesError()
 
+    def _raise_calls_not_retained(self, error, arguments, keyword_arguments):
+        expected_call_entry = FluentCallEntry(self.object, self.attribute_name, arguments, keyword_arguments)
+        raise VerificationError(expected_call_entry, self._matcher, reason=str(error))
+
     def __call__(self, *arguments, **keyword_arguments):
         self._ensure_valid_usage_of_any_arguments(arguments)
-        count_of_matching_calls = self._count_matching_call_entries(arguments, keyword_arguments)
+        arguments, keyword_arguments = self._registry.canonical_arguments(self.object, self.attribute_name,
+                                                                          arguments, keyword_arguments)
+        try:
+            count_of_matching_calls = self._count_matching_call_entries(arguments, keyword_arguments)
+        except CallsNotRetainedError as error:
+            self._raise_calls_not_retained(error, arguments, keyword_arguments)
 
         if not self._matcher.matches(count_of_matching_calls):
             expected_call_entry = FluentCallEntry(self.object, self.attribute_name, arguments, keyword_arguments)
 
             method_of_mock = getattr(self.object, self.attribute_name)
             is_a_mock_method = isinstance(self.object, Mock) and isinstance(method_of_mock, Mock)
-            if not is_a_mock_method and len(_call_entries) == 0:
+            if not is_a_mock_method and not self._registry.has_calls():
                 raise VerificationError(expected_call_entry, self._matcher,
                                         reason='No patched function has been called.')
 
-            found_calls = []
-
-            for call_entry in _call_entries:
-                target = call_entry.target
-                if target.is_equal_to(self.object, self.attribute_name):
-                    found_calls.append(call_entry)
+            found_calls = self._registry.get_calls(self.object, self.attribute_name)
 
             if isinstance(self.object, Mock):
                 for method_call in self.object.method_calls:
-                    actual_call_address = 'call ' + self.name
-                    method_call_as_string = str(method_call).replace('call', actual_call_address)
-                    found_calls.append(method_call_as_string)
+                    found_calls.append(MethodCallOfMock(self.name, method_call))
 
             raise VerificationError(expected_call_entry, self._matcher, found_calls=found_calls)
 
+    def awaited(self, *arguments, **keyword_arguments):
+        """ Verifies that calls to a patched coroutine function have been awaited. """
+        self._ensure_valid_usage_of_any_arguments(arguments)
+        arguments, keyword_arguments = self._registry.canonical_arguments(self.object, self.attribute_name,
+                                                                          arguments, keyword_arguments)
+        try:
+            expected_call_entry = FluentCallEntry(self.object, self.attribute_name, arguments, keyword_arguments)
+            count_of_matching_awaits = self._registry.count_matching_calls(expected_call_entry, awaited=True)
+        except CallsNotRetainedError as error:
+            self._raise_calls_not_retained(error, arguments, keyword_arguments)
+
+        if not self._matcher.matches(count_of_matching_awaits):
+            expected_call_entry = FluentCallEntry(self.object, self.attribute_name, arguments, keyword_arguments)
+            found_awaits = self._registry.get_calls(self.object, self.attribute_name, awaited=True)
+
+            if not found_awaits:
+                raise VerificationError(expected_call_entry, self._matcher,
+                                        reason='No call of the patched function has been awaited.')
+
+            raise VerificationError(expected_call_entry, self._matcher, found_calls=found_awaits)
+
+
+class FluentExpectation(Verifier):
+    """ An expected call, which is verified together with others using verify_all or verify_in_order. """
+
+    def __init__(self, target, times):
+        Verifier.__init__(self, target, times)
+        self.arguments = ()
+        self.keyword_arguments = {}
+        self._expected_call_entry = None
+
+    def __call__(self, *arguments, **keyword_arguments):
+        self._ensure_valid_usage_of_any_arguments(arguments)
+        arguments, keyword_arguments = self._registry.canonical_arguments(self.object, self.attribute_name,
+                                                                          arguments, keyword_arguments)
+        self.arguments = arguments
+        self.keyword_arguments = keyword_arguments
+        self._expected_call_entry = None
+        return self
+
+    def _get_expected_call_entry(self):
+        if self._expected_call_entry is None:
+            self._expected_call_entry = FluentCallEntry(self.object, self.attribute_name,
+                                                        self.arguments, self.keyword_arguments)
+        return self._expected_call_entry
+
+    def _is_expecting_calls(self):
+        return not isinstance(self._matcher, NeverMatcher)
+
+    def _is_a_mock_method(self):
+        method_of_mock = getattr(self.object, self.attribute_name)
+        return isinstance(self.object, Mock) and isinstance(method_of_mock, Mock)
+
+    def _count_calls_of_mock_method(self):
+        return self._count_matching_call_entries(self.arguments, self.keyword_arguments)
+
+    def _matches_call_entry(self, call_entry):
+        if not call_entry.target.is_equal_to(self.object, self.attribute_name):
+            return False
+        return call_entry.matches_arguments_of(self._get_expected_call_entry())
+
+    def _is_satisfied_by(self, count_of_matching_calls):
+        return self._matcher.matches(count_of_matching_calls)
+
+    def _create_error(self, reason="", found_calls=None):
+        return VerificationError(self._get_expected_call_entry(), self._matcher, reason=reason, found_calls=found_calls)
+
+
+def _verify_expectations(expectations, in_order):
+    registry = get_registry()
+    counts = [0] * len(expectations)
+    expectations_by_target = {}
+    ordered_expectations = []
+    errors = []
+
+    for position, expectation in enumerate(expectations):
+        if expectation._is_a_mock_method():
+            counts[position] = expectation._count_calls_of_mock_method()
+            if in_order and expectation._is_expecting_calls():
+                errors.append(expectation._create_error(reason='The order of calls of a plain Mock is not recorded.'))
+            continue
+
+        recording_policy = expectation._registry.get_recording_policy(expectation.object, expectation.attribute_name)
+        if recording_policy not in (None, RECORD_ALL) or expectation._registry is not registry:
+            try:
+                counts[position] = expectation._count_matching_call_entries(expectation.arguments,
+                                                                            expectation.keyword_arguments)
+            except CallsNotRetainedError as error:
+                errors.append(expectation._create_error(reason=str(error)))
+                counts[position] = None
+            if in_order and expectation._is_expecting_calls():
+                if expectation._registry is not registry:
+                    reason = 'The calls have been recorded in an outer scope, their order is not known.'
+                else:
+                    reason = 'The order of calls has not been recorded.'
+                errors.append(expectation._create_error(reason=reason))
+            continue
+
+        target_key = (expectation.object, expectation.attribute_name)
+        expectations_by_target.setdefault(target_key, []).append((position, expectation))
+        if in_order and expectation._is_expecting_calls():
+            ordered_expectations.append(expectation)
+
+    with registry.lock:
+        call_entries = list(registry.call_entries)
+
+    next_in_order = 0
+    for call_entry in call_entries:
+        target_key = (call_entry.target.object, call_entry.target.attribute_name)
+        expectations_of_target = expectations_by_target.get(target_key)
+        if expectations_of_target is None:
+            continue
+
+        for position, expectation in expectations_of_target:
+            if expectation._matches_call_entry(call_entry):
+                counts[position] += 1
+
+        if next_in_order < len(ordered_expectations):
+            if ordered_expectations[next_in_order]._matches_call_entry(call_entry):
+                next_in_order += 1
+
+    for position, expectation in enumerate(expectations):
+        if counts[position] is None or expectation._is_satisfied_by(counts[position]):
+            continue
+
+        if expectation._is_a_mock_method():
+            found_calls = [MethodCallOfMock(expectation.name, method_call)
+                           for method_call in expectation.object.method_calls]
+            errors.append(expectation._create_error(found_calls=found_calls))
+        elif not expectation._registry.has_calls():
+            errors.append(expectation._create_error(reason='No patched function has been called.'))
+        else:
+            found_calls = expectation._registry.get_calls(expectation.object, expectation.attribute_name)
+            errors.append(expectation._create_error(found_calls=found_calls))
+
+    if next_in_order < len(ordered_expectations):
+        errors.append(ordered_expectations[next_in_order]._create_error(reason='Not called in the given order.'))
+
+    if errors:
+        raise AggregatedVerificationError(errors)
+
+
+def _is_coroutine_function(function):
+    is_coroutine_function = getattr(inspect, 'iscoroutinefunction', None)
+    if is_coroutine_function is None:
+        return False
+    return is_coroutine_function(function)
+
+
+_SPECIFICATION_ATTRIBUTES = ('_spec_class', '_spec_set', '_spec_signature', '_spec_asyncs', '_mock_methods')
+
+
+class MockFactory(object):
+    """ Creates mocks of a specification class, which is introspected only for the first mock. """
+
+    def __init__(self, specification, spec_set=False):
+        self.specification = specification
+        self.spec_set = spec_set
+        self._specification_attributes = None
+
+    def __call__(self, **properties):
+        specification_attributes = self._specification_attributes
+
+        if specification_attributes is None:
+            if self.spec_set:
+                mock = Mock(spec_set=self.specification)
+            else:
+                mock = Mock(self.specification)
+            self._specification_attributes = dict((name, mock.__dict__[name]) for name in _SPECIFICATION_ATTRIBUTES
+                                                  if name in mock.__dict__)
+        else:
+            mock = Mock()
+            mock.__dict__.update(specification_attributes)
+
+        for property_name in properties.keys():
+            setattr(mock, property_name, properties[property_name])
+
+        return mock
+
+
+_mock_factories = WeakKeyDictionary()
+_mock_factories_lock = RLock()
+
+
+def mock_factory(specification, spec_set=False):
+    """ Returns the shared factory of mocks of a class, which restricts the attributes of the mocks to spec_set. """
+    with _mock_factories_lock:
+        factories = _mock_factories.get(specification)
+        if factories is None:
+            factories = _mock_factories[specification] = {}
+
+        factory = factories.get(spec_set)
+        if factory is None:
+            factory = factories[spec_set] = MockFactory(specification, spec_set)
+        return factory
+
 
 def create_mock(*arguments, **keyword_arguments):
     if len(arguments) > 0:
         specification = arguments[0]
+        if isinstance(specification, _CLASS_TYPES):
+            return mock_factory(specification)(**keyword_arguments)
         mock = Mock(specification)
     else:
         mock = Mock()
@@ -435,23 +1408,101 @@ def create_mock(*arguments, **keyword_arguments):
 
 
 def undo_patches():
-    global _call_entries, _patch_entries, _configurators
+    get_registry().undo()
+
+
+class FluentScope(object):
+    """ Patches, answers and calls of a scope are kept in a registry of their own, which is undone when the
+        scope exits. Patches of outer scopes stay in place and can be verified within the scope. """
+
+    def __init__(self):
+        self.registry = None
+        self._registry_token = None
+
+    def __enter__(self):
+        self.registry = FluentRegistry(parent=get_registry())
+        self._registry_token = _activate_registry(self.registry)
+        return self.registry
+
+    def __exit__(self, exception_type, exception_value, traceback):
+        try:
+            self.registry.undo()
+        finally:
+            _deactivate_registry(self._registry_token)
+        return False
+
+
+def scope():
+    """ Returns a context manager which undoes the patches made within it when it exits. """
+    return FluentScope()
+
 
-    for patch_entry in _patch_entries:
-        patch_entry.undo()
+def scoped(function):
+    """ Decorates a function (or coroutine function) to make its patches within a scope of its own. """
+    if _is_coroutine_function(function):
+        return scoped_coroutine_function(function, scope)
 
-    _call_entries = []
-    _patch_entries = []
-    _configurators = {}
+    @wraps(function)
+    def function_within_scope(*arguments, **keyword_arguments):
+        with scope():
+            return function(*arguments, **keyword_arguments)
+
+    return function_within_scope
 
 
 def get_patches():
-    return _patch_entries
+    return get_registry().patch_entries
+
+
+def get_registry():
+    """ Returns the registry of the current test, thread or asyncio task. """
+    registry = _get_active_registry()
+    if registry is None:
+        return _default_registry
+    return registry
+
 
+def when(target, recording=None, retention=None, autospec=False, normalize=False):
+    """ Configures answers of the given target. The recording policy (e.g. RECORD_COUNTS or record_last(100))
+        decides which data of the calls is retained for verification, the argument retention (e.g.
+        RETAIN_WEAK_REFERENCES or RETAIN_DIGESTS) how the recorded calls keep their arguments.
+        With autospec the answers and calls are checked against the signature of the patched callable,
+        and positional and keyword forms of the same call are treated as equal. With normalize only the
+        latter applies, arguments which do not match the signature are kept as given. """
+    return FluentWhen(target, recording, retention, autospec, normalize)
 
-def when(target):
-    return FluentWhen(target)
+
+def set_recording_policy(recording_policy):
+    """ Sets the recording policy for all targets patched after this call in the current registry. """
+    get_registry().recording_policy = recording_policy
+
+
+def set_argument_retention(argument_retention):
+    """ Sets the argument retention for all targets patched after this call in the current registry. """
+    get_registry().argument_retention = argument_retention
 
 
 def verify(target, times=AT_LEAST_ONCE):
     return Verifier(target, times)
+
+
+def expect(target, times=AT_LEAST_ONCE):
+    return FluentExpectation(target, times)
+
+
+def verify_all(*expectations, **keyword_arguments):
+    """ Verifies all given expectations in a single pass over the recorded calls.
+
+        All failed expectations are reported together in one AggregatedVerificationError.
+        Use in_order=True to verify that the expected calls have been made in the given order.
+    """
+    in_order = keyword_arguments.pop('in_order', False)
+    if keyword_arguments:
+        raise TypeError('Unexpected keyword arguments: {0}'.format(', '.join(sorted(keyword_arguments))))
+
+    _verify_expectations(expectations, in_order)
+
+
+def verify_in_order(*expectations):
+    """ Verifies all given expectations and that the expected calls have been made in the given order. """
+    _verify_expectations(expectations, in_order=True)
@@ -0,0 +1,43 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Support for patching coroutine functions. Requires Python 3.5 or later. """
+
+from functools import wraps
+
+
+async def answer_when_awaited(registry, call_entry, signature, answer):
+    """ Returned as a coroutine by a patched coroutine function. Records the await and answers. """
+    registry.record_await(call_entry, signature)
+
+    if answer is None:
+        return None
+
+    result = answer()
+    if getattr(answer, 'is_awaited', False):
+        result = await result
+
+    return result
+
+
+def scoped_coroutine_function(function, scope):
+    """ Decorates a coroutine function to make its patches within a scope, which lasts until it returns. """
+
+    @wraps(function)
+    async def coroutine_function_within_scope(*arguments, **keyword_arguments):
+        with scope():
+            return await function(*arguments, **keyword_arguments)
+
+    return coroutine_function_within_scope
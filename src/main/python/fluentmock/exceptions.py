@@ -23,6 +23,27 @@ class InvalidAttributeError(Exception):
         super(InvalidAttributeError, self).__init__(error_message)
 
 
+class AutospecNotSupportedError(Exception):
+
+    MESSAGE_FORMAT = ('The target "{target_name}" can not be patched with autospec, since signatures can not be '
+                      'determined without inspect.signature (Python 3.3 or later).')
+
+    def __init__(self, target_name):
+        error_message = self.MESSAGE_FORMAT.format(target_name=target_name)
+        super(AutospecNotSupportedError, self).__init__(error_message)
+
+
+class ConflictingOptionsError(ValueError):
+
+    MESSAGE_FORMAT = ('The target "{target_name}" has already been patched with {option} {patched_value}, '
+                      'it can not be configured with {option} {value}.')
+
+    def __init__(self, target_name, option, patched_value, value):
+        error_message = self.MESSAGE_FORMAT.format(target_name=target_name, option=option,
+                                                   patched_value=patched_value, value=value)
+        super(ConflictingOptionsError, self).__init__(error_message)
+
+
 class InvalidUseOfAnyValuesError(AssertionError):
 
     MESSAGE_FORMAT = """Do not use ANY_VALUES together with other arguments!
@@ -32,25 +53,78 @@ Use ANY_VALUE as a wildcard for single arguments."""
         super(InvalidUseOfAnyValuesError, self).__init__(self.MESSAGE_FORMAT)
 
 
+class SignatureMismatchError(TypeError):
+
+    MESSAGE_FORMAT = 'The arguments {arguments} do not match the signature {target_name}{signature}: {reason}'
+
+    def __init__(self, target_name, signature, arguments, reason):
+        error_message = self.MESSAGE_FORMAT.format(target_name=target_name, signature=signature,
+                                                   arguments=arguments, reason=reason)
+        super(SignatureMismatchError, self).__init__(error_message)
+
+
 class VerificationError(AssertionError):
 
     MESSAGE_FORMAT = "\nExpected: {expected_call_entry} {matcher_string}\n"
     BUT_WAS_FORMAT = " but was: {actual}\n"
     ADDITIONAL_CALL_ENTRIES = ' ' * 10 + '{actual}\n'
+    MORE_CALL_ENTRIES = ' ' * 10 + '... and {count} more calls\n'
+
+    MAXIMUM_NUMBER_OF_LISTED_CALLS = 100
 
     def __init__(self, expected_call_entry, matcher, reason="", found_calls=None):
-        error_message = self.MESSAGE_FORMAT.format(expected_call_entry=expected_call_entry, matcher_string=str(matcher))
+        super(VerificationError, self).__init__(expected_call_entry, matcher, reason, found_calls)
+        self.expected_call_entry = expected_call_entry
+        self.matcher = matcher
+        self.reason = reason
+        self.found_calls = found_calls
 
-        if reason:
-            error_message += "  Reason: " + reason + "\n"
+    def __str__(self):
+        """ Renders the message on demand, since failed verifications are often expected and never printed. """
+        lines = [self.MESSAGE_FORMAT.format(expected_call_entry=self.expected_call_entry,
+                                            matcher_string=str(self.matcher))]
 
+        if self.reason:
+            lines.append("  Reason: " + self.reason + "\n")
+
+        found_calls = self.found_calls
         if found_calls:
-            error_message += self.BUT_WAS_FORMAT.format(actual=found_calls[0])
-            if len(found_calls) > 1:
-                for call_entry in found_calls[1:]:
-                    error_message += self.ADDITIONAL_CALL_ENTRIES.format(actual=call_entry)
+            lines.append(self.BUT_WAS_FORMAT.format(actual=found_calls[0]))
+
+            number_of_listed_calls = min(len(found_calls), self.MAXIMUM_NUMBER_OF_LISTED_CALLS)
+            for index in range(1, number_of_listed_calls):
+                lines.append(self.ADDITIONAL_CALL_ENTRIES.format(actual=found_calls[index]))
+
+            if len(found_calls) > number_of_listed_calls:
+                lines.append(self.MORE_CALL_ENTRIES.format(count=len(found_calls) - number_of_listed_calls))
+
+        return ''.join(lines)
+
+
+class AggregatedVerificationError(VerificationError):
+
+    MESSAGE_FORMAT = "\n{count} of the expected calls could not be verified:\n"
+
+    def __init__(self, errors):
+        AssertionError.__init__(self, errors)
+        self.errors = errors
+
+    def __str__(self):
+        lines = [self.MESSAGE_FORMAT.format(count=len(self.errors))]
+        for error in self.errors:
+            lines.append(str(error))
+        return ''.join(lines)
+
+
+class CallsNotRetainedError(Exception):
+
+    MESSAGE_FORMAT = ('The calls have been recorded retaining only {recording_policy}, '
+                      'which is not enough to verify this.')
 
-        super(VerificationError, self).__init__(error_message)
+    def __init__(self, recording_policy):
+        error_message = self.MESSAGE_FORMAT.format(recording_policy=recording_policy)
+        super(CallsNotRetainedError, self).__init__(error_message)
+        self.recording_policy = recording_policy
 
 
 class MatcherException(Exception):
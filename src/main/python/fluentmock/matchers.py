@@ -13,41 +13,210 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import re
+
 from fluentmock.exceptions import MatcherException
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+COST_OF_CONSTANT = 0
+COST_OF_TYPE_CHECK = 1
+COST_OF_COMPARISON = 2
+COST_OF_SEARCH = 3
+COST_OF_UNKNOWN = 4
+
+MAXIMUM_LENGTH_OF_ARRAY_SUMMARY = 60
+
 
 class FluentMatcher(object):
 
+    # the relative cost of a match, combined matchers are evaluated starting with the cheapest matcher
+    cost = COST_OF_UNKNOWN
+
     def matches(self, value):
         raise NotImplementedError()
 
+    def matches_captured_argument(self, captured_argument):
+        """ Matches an argument which has been captured by an argument retention, e.g. as a digest. """
+        return self.matches(captured_argument.retained_value())
+
     def _matcher_string(self, text):
         return '<< {text} >>'.format(text=text)
 
+    def __and__(self, other):
+        if not isinstance(other, FluentMatcher):
+            return NotImplemented
+        return AllOfMatcher(self, other)
+
+    def __or__(self, other):
+        if not isinstance(other, FluentMatcher):
+            return NotImplemented
+        return AnyMatcher(self, other)
+
+    def __invert__(self):
+        return NotMatcher(self)
+
     def __repr__(self):
         raise NotImplementedError()
 
 
+def _arrays_equal(value, other):
+    if numpy is not None:
+        try:
+            return bool(numpy.array_equal(value, other))
+        except (TypeError, ValueError):
+            return False
+
+    try:
+        return memoryview(value) == memoryview(other)
+    except TypeError:
+        return False
+
+
+def values_differ(value, other):
+    """ Compares two values like != does, including arrays which are compared element-wise. """
+    try:
+        return bool(value != other)
+    except ValueError:
+        return not _arrays_equal(value, other)
+
+
+def _matcher_text(matcher):
+    text = repr(matcher)
+    if text.startswith('<< ') and text.endswith(' >>'):
+        return text[3:-3]
+    return text
+
+
+def _ensure_matchers(matchers):
+    if not matchers:
+        raise MatcherException("Please provide at least one matcher!")
+
+    for matcher in matchers:
+        if not isinstance(matcher, FluentMatcher):
+            raise MatcherException('Value {value!r} is not a matcher.'.format(value=matcher))
+
+
+def _flatten(matcher_type, matchers):
+    flattened_matchers = []
+    for matcher in matchers:
+        if type(matcher) is matcher_type:
+            flattened_matchers.extend(matcher.matchers)
+        else:
+            flattened_matchers.append(matcher)
+    return flattened_matchers
+
+
+class AllOfMatcher(FluentMatcher):
+
+    def __init__(self, *matchers):
+        _ensure_matchers(matchers)
+        self.matchers = _flatten(AllOfMatcher, matchers)
+        self._matchers_by_cost = sorted(self.matchers, key=lambda matcher: matcher.cost)
+        self.cost = max(matcher.cost for matcher in self.matchers)
+
+    def matches(self, value):
+        for matcher in self._matchers_by_cost:
+            if not matcher.matches(value):
+                return False
+
+        return True
+
+    def matches_captured_argument(self, captured_argument):
+        for matcher in self._matchers_by_cost:
+            if not matcher.matches_captured_argument(captured_argument):
+                return False
+
+        return True
+
+    def __repr__(self):
+        text = ' and '.join(_matcher_text(matcher) for matcher in self.matchers)
+        return self._matcher_string('({text})'.format(text=text))
+
+
+class AnyMatcher(FluentMatcher):
+
+    def __init__(self, *matchers):
+        _ensure_matchers(matchers)
+        self.matchers = _flatten(AnyMatcher, matchers)
+        self._matchers_by_cost = sorted(self.matchers, key=lambda matcher: matcher.cost)
+        self.cost = max(matcher.cost for matcher in self.matchers)
+
+    def matches(self, value):
+        for matcher in self._matchers_by_cost:
+            if matcher.matches(value):
+                return True
+
+        return False
+
+    def matches_captured_argument(self, captured_argument):
+        for matcher in self._matchers_by_cost:
+            if matcher.matches_captured_argument(captured_argument):
+                return True
+
+        return False
+
+    def __repr__(self):
+        text = ' or '.join(_matcher_text(matcher) for matcher in self.matchers)
+        return self._matcher_string('({text})'.format(text=text))
+
+
+class NotMatcher(FluentMatcher):
+
+    def __init__(self, matcher):
+        _ensure_matchers((matcher,))
+        self.matcher = matcher
+        self.cost = matcher.cost
+
+    def matches(self, value):
+        return not self.matcher.matches(value)
+
+    def matches_captured_argument(self, captured_argument):
+        return not self.matcher.matches_captured_argument(captured_argument)
+
+    def __invert__(self):
+        return self.matcher
+
+    def __repr__(self):
+        return self._matcher_string('not {text}'.format(text=_matcher_text(self.matcher)))
+
+
 class AnyValuesMatcher(FluentMatcher):
 
+    cost = COST_OF_CONSTANT
+
     def matches(self, value):
         return True
 
+    def matches_captured_argument(self, captured_argument):
+        return True
+
     def __repr__(self):
         return self._matcher_string('ANY_VALUES')
 
 
 class AnyValueMatcher(FluentMatcher):
 
+    cost = COST_OF_CONSTANT
+
     def matches(self, value):
         return True
 
+    def matches_captured_argument(self, captured_argument):
+        return True
+
     def __repr__(self):
         return self._matcher_string('ANY_VALUE')
 
 
 class AnyValueOfTypeMatcher(FluentMatcher):
 
+    cost = COST_OF_TYPE_CHECK
+
     def __init__(self, expected_type):
 
         self._expected_type = expected_type
@@ -59,6 +228,9 @@ class AnyValueOfTypeMatcher(FluentMatcher):
 
         return False
 
+    def matches_captured_argument(self, captured_argument):
+        return issubclass(captured_argument.type, self._expected_type)
+
     def __repr__(self):
         type_name = self._expected_type.__name__
         text = 'Any value of type "{type_name}"'.format(type_name=type_name)
@@ -67,14 +239,30 @@ class AnyValueOfTypeMatcher(FluentMatcher):
 
 class AnyOfMatcher(FluentMatcher):
 
+    cost = COST_OF_COMPARISON
+
     def __init__(self, *list_elements):
         if not list_elements:
             raise MatcherException("Please provide at least one element!")
 
         self.elements = list(list_elements)
+        self._hashable_elements = set()
+        self._unhashable_elements = []
+
+        for element in self.elements:
+            try:
+                self._hashable_elements.add(element)
+            except TypeError:
+                self._unhashable_elements.append(element)
 
     def matches(self, value):
-        if value in self.elements:
+        try:
+            if value in self._hashable_elements:
+                return True
+        except TypeError:
+            return value in self.elements
+
+        if value in self._unhashable_elements:
             return True
 
         return False
@@ -83,8 +271,33 @@ class AnyOfMatcher(FluentMatcher):
         return self._matcher_string('Any value in {elements}'.format(elements=self.elements))
 
 
+class AnyInRangeMatcher(FluentMatcher):
+
+    cost = COST_OF_COMPARISON
+
+    def __init__(self, lower_bound, upper_bound):
+        if not lower_bound < upper_bound:
+            raise MatcherException("Please provide a lower bound which is less than the upper bound!")
+
+        self._lower_bound = lower_bound
+        self._upper_bound = upper_bound
+
+    def matches(self, value):
+        try:
+            return self._lower_bound <= value < self._upper_bound
+        except TypeError:
+            return False
+
+    def __repr__(self):
+        text = 'Any value in range [{lower_bound}, {upper_bound})'.format(lower_bound=self._lower_bound,
+                                                                          upper_bound=self._upper_bound)
+        return self._matcher_string(text)
+
+
 class ContainsMatcher(FluentMatcher):
 
+    cost = COST_OF_SEARCH
+
     def __init__(self, substring):
         self._substring = substring
 
@@ -96,8 +309,88 @@ class ContainsMatcher(FluentMatcher):
         return self._matcher_string(text)
 
 
+class RegexMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, pattern, flags=0):
+        if not hasattr(pattern, 'search'):
+            pattern = re.compile(pattern, flags)
+        self._pattern = pattern
+
+    def matches(self, value):
+        try:
+            return self._pattern.search(value) is not None
+        except TypeError:
+            return False
+
+    def __repr__(self):
+        text = 'a string matching "{pattern}"'.format(pattern=self._pattern.pattern)
+        return self._matcher_string(text)
+
+
+def _compile_substrings(substrings):
+    if not substrings:
+        raise MatcherException("Please provide at least one substring!")
+
+    longest_first = sorted(set(substrings), key=len, reverse=True)
+    alternatives = '|'.join(re.escape(substring) for substring in longest_first)
+    return re.compile('(?=({alternatives}))'.format(alternatives=alternatives), re.DOTALL)
+
+
+class ContainsAnyMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, *substrings):
+        self._pattern = _compile_substrings(substrings)
+        self._substrings = list(substrings)
+
+    def matches(self, value):
+        try:
+            return self._pattern.search(value) is not None
+        except TypeError:
+            return False
+
+    def __repr__(self):
+        text = 'a string containing any of {substrings}'.format(substrings=self._substrings)
+        return self._matcher_string(text)
+
+
+class ContainsAllMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, *substrings):
+        self._pattern = _compile_substrings(substrings)
+        self._substrings = list(substrings)
+        self._contained_substrings = {}
+
+        for substring in self._substrings:
+            self._contained_substrings[substring] = set(other for other in self._substrings if other in substring)
+
+    def matches(self, value):
+        missing_substrings = set(self._substrings)
+
+        try:
+            for match in self._pattern.finditer(value):
+                missing_substrings.difference_update(self._contained_substrings[match.group(1)])
+                if not missing_substrings:
+                    return True
+        except TypeError:
+            return False
+
+        return False
+
+    def __repr__(self):
+        text = 'a string containing all of {substrings}'.format(substrings=self._substrings)
+        return self._matcher_string(text)
+
+
 class ListContainsMatcher(FluentMatcher):
 
+    cost = COST_OF_SEARCH
+
     def __init__(self, element):
         self._element = element
 
@@ -116,8 +409,235 @@ class ListContainsMatcher(FluentMatcher):
         return self._matcher_string(text)
 
 
+class IterableContainsMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, element):
+        self._element = element
+
+    def matches(self, value):
+        try:
+            return bool(self._element in value)
+        except TypeError:
+            pass
+
+        try:
+            iterator = iter(value)
+        except TypeError:
+            return False
+
+        for item in iterator:
+            if item == self._element:
+                return True
+
+        return False
+
+    def __repr__(self):
+        text = 'an iterable containing element {element}'.format(element=repr(self._element))
+        return self._matcher_string(text)
+
+
+class AllElementsMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, matcher):
+        _ensure_matchers((matcher,))
+        self._matcher = matcher
+
+    def matches(self, value):
+        try:
+            iterator = iter(value)
+        except TypeError:
+            return False
+
+        for item in iterator:
+            if not self._matcher.matches(item):
+                return False
+
+        return True
+
+    def __repr__(self):
+        text = 'an iterable with all elements matching {matcher}'.format(matcher=_matcher_text(self._matcher))
+        return self._matcher_string(text)
+
+
+class AnyElementMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, matcher):
+        _ensure_matchers((matcher,))
+        self._matcher = matcher
+
+    def matches(self, value):
+        try:
+            iterator = iter(value)
+        except TypeError:
+            return False
+
+        for item in iterator:
+            if self._matcher.matches(item):
+                return True
+
+        return False
+
+    def __repr__(self):
+        text = 'an iterable with an element matching {matcher}'.format(matcher=_matcher_text(self._matcher))
+        return self._matcher_string(text)
+
+
+class LengthMatcher(FluentMatcher):
+
+    cost = COST_OF_COMPARISON
+
+    def __init__(self, length):
+        self._length = length
+
+    def matches(self, value):
+        try:
+            return len(value) == self._length
+        except TypeError:
+            pass
+
+        try:
+            iterator = iter(value)
+        except TypeError:
+            return False
+
+        length = 0
+        for _ in iterator:
+            length += 1
+            if length > self._length:
+                return False
+
+        return length == self._length
+
+    def __repr__(self):
+        text = 'an iterable of length {length}'.format(length=self._length)
+        return self._matcher_string(text)
+
+
+def _bytes_of(value):
+    view = memoryview(value)
+    try:
+        return view.cast('B')
+    except (AttributeError, TypeError):
+        return memoryview(view.tobytes())
+
+
+class ArrayEqualMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, expected):
+        if numpy is not None:
+            expected = numpy.asarray(expected)
+        else:
+            try:
+                memoryview(expected)
+            except TypeError:
+                raise MatcherException('Please install numpy to compare arrays which do not provide a buffer.')
+
+        self._expected = expected
+
+    def matches(self, value):
+        return _arrays_equal(value, self._expected)
+
+    def __repr__(self):
+        text = 'an array equal to {expected}'.format(expected=_summary_of_array(self._expected))
+        return self._matcher_string(text)
+
+
+class ArrayCloseMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, expected, rtol=1e-05, atol=1e-08):
+        if numpy is None:
+            raise MatcherException('Please install numpy to compare arrays with a tolerance.')
+
+        self._expected = numpy.asarray(expected)
+        self._rtol = rtol
+        self._atol = atol
+
+    def matches(self, value):
+        try:
+            value = numpy.asarray(value)
+            if value.shape != self._expected.shape:
+                return False
+            return bool(numpy.allclose(value, self._expected, rtol=self._rtol, atol=self._atol))
+        except (TypeError, ValueError):
+            return False
+
+    def __repr__(self):
+        text = 'an array close to {expected} (rtol={rtol}, atol={atol})'.format(
+            expected=_summary_of_array(self._expected), rtol=self._rtol, atol=self._atol)
+        return self._matcher_string(text)
+
+
+class ArrayShapeMatcher(FluentMatcher):
+
+    cost = COST_OF_COMPARISON
+
+    def __init__(self, shape):
+        if isinstance(shape, int):
+            shape = (shape,)
+        self._shape = tuple(shape)
+
+    def matches(self, value):
+        shape = getattr(value, 'shape', None)
+        if shape is None:
+            return False
+        return tuple(shape) == self._shape
+
+    def __repr__(self):
+        text = 'an array of shape {shape}'.format(shape=self._shape)
+        return self._matcher_string(text)
+
+
+class BufferEqualMatcher(FluentMatcher):
+
+    cost = COST_OF_SEARCH
+
+    def __init__(self, expected):
+        try:
+            self._expected = _bytes_of(expected)
+        except TypeError:
+            raise MatcherException('Value of type "%s" does not provide a buffer.' % type(expected).__name__)
+
+    def matches(self, value):
+        try:
+            view = _bytes_of(value)
+        except TypeError:
+            return False
+
+        if len(view) != len(self._expected):
+            return False
+
+        return view == self._expected
+
+    def __repr__(self):
+        text = 'a buffer of {size} bytes equal to {expected}'.format(size=len(self._expected),
+                                                                     expected=_summary_of_array(self._expected))
+        return self._matcher_string(text)
+
+
+def _summary_of_array(value):
+    if isinstance(value, memoryview):
+        value = value.tobytes()
+
+    summary = repr(value)
+    if len(summary) > MAXIMUM_LENGTH_OF_ARRAY_SUMMARY:
+        summary = summary[:MAXIMUM_LENGTH_OF_ARRAY_SUMMARY] + '...'
+    return summary
+
+
 class NeverMatcher(FluentMatcher):
 
+    cost = COST_OF_COMPARISON
+
     def matches(self, value):
         if value != 0:
             return False
@@ -130,6 +650,8 @@ class NeverMatcher(FluentMatcher):
 
 class AtLeastOnceMatcher(FluentMatcher):
 
+    cost = COST_OF_COMPARISON
+
     def matches(self, value):
 
         if value == 0:
@@ -143,6 +665,8 @@ class AtLeastOnceMatcher(FluentMatcher):
 
 class TimesMatcher(FluentMatcher):
 
+    cost = COST_OF_COMPARISON
+
     def __init__(self, expected):
         self._expected = expected
 
@@ -158,10 +682,58 @@ class TimesMatcher(FluentMatcher):
         return self._matcher_string(text)
 
 
+def all_of(*matchers):
+    return AllOfMatcher(*matchers)
+
+
+def either(*matchers):
+    return AnyMatcher(*matchers)
+
+
+any_matcher = either
+
+
+def not_(matcher):
+    _ensure_matchers((matcher,))
+    return ~matcher
+
+
+def array_equal_to(expected):
+    return ArrayEqualMatcher(expected)
+
+
+def array_close_to(expected, rtol=1e-05, atol=1e-08):
+    return ArrayCloseMatcher(expected, rtol, atol)
+
+
+def array_of_shape(shape):
+    return ArrayShapeMatcher(shape)
+
+
+def buffer_equal_to(expected):
+    return BufferEqualMatcher(expected)
+
+
 def a_list_containing(element):
     return ListContainsMatcher(element)
 
 
+def an_iterable_containing(element):
+    return IterableContainsMatcher(element)
+
+
+def all_elements_match(matcher):
+    return AllElementsMatcher(matcher)
+
+
+def any_element_matches(matcher):
+    return AnyElementMatcher(matcher)
+
+
+def has_length(length):
+    return LengthMatcher(length)
+
+
 def any_value_of_type(the_type):
     return AnyValueOfTypeMatcher(the_type)
 
@@ -170,5 +742,25 @@ def any_of(*list_elements):
     return AnyOfMatcher(*list_elements)
 
 
+def any_of_set(elements):
+    return AnyOfMatcher(*elements)
+
+
+def any_in_range(lower_bound, upper_bound):
+    return AnyInRangeMatcher(lower_bound, upper_bound)
+
+
 def contains(substring):
     return ContainsMatcher(substring)
+
+
+def contains_any(*substrings):
+    return ContainsAnyMatcher(*substrings)
+
+
+def contains_all(*substrings):
+    return ContainsAllMatcher(*substrings)
+
+
+def matches_regex(pattern, flags=0):
+    return RegexMatcher(pattern, flags)
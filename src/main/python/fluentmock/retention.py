@@ -0,0 +1,290 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Argument retention modes decide how recorded calls keep their arguments alive. """
+
+from hashlib import sha1
+from weakref import ref
+
+import pickle
+import types
+
+from fluentmock.exceptions import CallsNotRetainedError
+from fluentmock.matchers import values_differ
+
+try:
+    _SMALL_VALUE_TYPES = (type(None), bool, int, long, float, complex)  # noqa: F821
+except NameError:
+    _SMALL_VALUE_TYPES = (type(None), bool, int, float, complex)
+
+try:
+    _TEXT_TYPES = (str, unicode)  # noqa: F821
+except NameError:
+    _TEXT_TYPES = (str, bytes)
+
+MAXIMUM_LENGTH_OF_RETAINED_TEXT = 64
+MAXIMUM_LENGTH_OF_SUMMARY = 60
+
+
+class CapturedArgument(object):
+    """ Stands in for an argument of a recorded call, without keeping the argument alive. """
+
+    # the type of the argument is retained, so that matchers of types work without the argument
+    __slots__ = ('_hash', 'type')
+
+    def retained_value(self):
+        """ Returns the argument, e.g. to be matched by a matcher, if it has been retained. """
+        raise NotImplementedError()
+
+    def __hash__(self):
+        if self._hash is None:
+            raise TypeError('unhashable argument')
+        return self._hash
+
+    def __ne__(self, other):
+        return not self == other
+
+
+def _hash_of(value):
+    try:
+        return hash(value)
+    except TypeError:
+        return None
+
+
+class WeakArgument(CapturedArgument):
+
+    __slots__ = ('_reference',)
+
+    def __init__(self, value):
+        self._reference = ref(value)
+        self.type = type(value)
+        self._hash = _hash_of(value)
+
+    def retained_value(self):
+        value = self._reference()
+        if value is None:
+            raise CallsNotRetainedError(RETAIN_WEAK_REFERENCES)
+        return value
+
+    def __eq__(self, other):
+        if isinstance(other, WeakArgument):
+            other = other._reference()
+        value = self._reference()
+        return value is not None and not values_differ(value, other)
+
+    __hash__ = CapturedArgument.__hash__
+
+    def __repr__(self):
+        value = self._reference()
+        if value is None:
+            return '<garbage collected {type_name}>'.format(type_name=self.type.__name__)
+        return repr(value)
+
+
+class ArgumentDigest(CapturedArgument):
+
+    __slots__ = ('_digest', '_summary')
+
+    def __init__(self, value):
+        self.type = type(value)
+        self._digest = digest_of(value)
+        self._hash = _hash_of(value)
+
+        summary = repr(value)
+        if len(summary) > MAXIMUM_LENGTH_OF_SUMMARY:
+            summary = summary[:MAXIMUM_LENGTH_OF_SUMMARY] + '...'
+        self._summary = summary
+
+    def retained_value(self):
+        raise CallsNotRetainedError(RETAIN_DIGESTS)
+
+    def __eq__(self, other):
+        if isinstance(other, ArgumentDigest):
+            return self.type is other.type and self._digest == other._digest
+        return type(other) is self.type and self._digest == digest_of(other)
+
+    __hash__ = CapturedArgument.__hash__
+
+    def __repr__(self):
+        return '<{type_name} sha1:{digest} {summary}>'.format(type_name=self.type.__name__,
+                                                              digest=self._digest[:12],
+                                                              summary=self._summary)
+
+
+class _UnorderedCollection(tuple):
+    """ Canonical form of a dict or set, whose items are sorted to be independent of their insertion order. """
+
+    __slots__ = ()
+
+
+def _pickled(value):
+    return pickle.dumps(value, 2)
+
+
+def _canonical_form(value, sort_key):
+    """ Returns the value with the dicts and sets in it replaced by their canonical form. """
+    value_type = type(value)
+    if value_type is dict:
+        items = [(_canonical_form(key, sort_key), _canonical_form(item, sort_key)) for key, item in value.items()]
+        return _UnorderedCollection(['dict'] + sorted(items, key=sort_key))
+    if value_type is set or value_type is frozenset:
+        elements = [_canonical_form(element, sort_key) for element in value]
+        return _UnorderedCollection([value_type.__name__] + sorted(elements, key=sort_key))
+    if value_type is list:
+        return [_canonical_form(element, sort_key) for element in value]
+    if value_type is tuple:
+        return tuple(_canonical_form(element, sort_key) for element in value)
+    return value
+
+
+def digest_of(value):
+    """ Returns a fingerprint of the given value, which is equal for equal values of the same type. """
+    try:
+        return sha1(memoryview(value)).hexdigest() + str(getattr(value, 'shape', ''))
+    except (TypeError, ValueError, BufferError):
+        pass
+
+    try:
+        return sha1(_pickled(_canonical_form(value, _pickled))).hexdigest()
+    except Exception:
+        return sha1(repr(_canonical_form(value, repr)).encode('utf-8')).hexdigest()
+
+
+class ArgumentRetention(object):
+
+    def __init__(self, description):
+        self.description = description
+
+    def capture(self, arguments, keyword_arguments):
+        """ Returns the arguments and keyword arguments to be retained by a recorded call. """
+        captured_arguments = tuple(self.capture_value(argument) for argument in arguments)
+        captured_keyword_arguments = dict((key, self.capture_value(value))
+                                          for key, value in keyword_arguments.items())
+        return captured_arguments, captured_keyword_arguments
+
+    def capture_value(self, value):
+        return value
+
+    def __repr__(self):
+        return self.description
+
+
+class WeakReferenceRetention(ArgumentRetention):
+
+    def capture_value(self, value):
+        try:
+            return WeakArgument(value)
+        except TypeError:
+            return value
+
+
+class DigestRetention(ArgumentRetention):
+
+    def capture_value(self, value):
+        if isinstance(value, _SMALL_VALUE_TYPES):
+            return value
+        if isinstance(value, _TEXT_TYPES) and len(value) <= MAXIMUM_LENGTH_OF_RETAINED_TEXT:
+            return value
+        return ArgumentDigest(value)
+
+
+RETAIN_ARGUMENTS = ArgumentRetention('the arguments')
+RETAIN_WEAK_REFERENCES = WeakReferenceRetention('weak references to the arguments')
+RETAIN_DIGESTS = DigestRetention('digests of the arguments')
+
+
+class ReplayableIterator(object):
+    """ Stands in for a generator passed to a patched function, which can be iterated again by each matcher.
+        The items are still taken from the generator, the caller can not iterate over them once more. """
+
+    __slots__ = ('_source', '_items')
+
+    def __init__(self, source):
+        self._source = source
+        self._items = []
+
+    def __iter__(self):
+        items = self._items
+        index = 0
+        while True:
+            if index < len(items):
+                yield items[index]
+            else:
+                try:
+                    item = next(self._source)
+                except StopIteration:
+                    return
+                items.append(item)
+                yield item
+            index += 1
+
+    def __eq__(self, other):
+        return other is self or other is self._source
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._source)
+
+    def __repr__(self):
+        return repr(self._source)
+
+
+def replayable_arguments(arguments, keyword_arguments):
+    """ Returns the arguments with each generator replaced by a lazily filled ReplayableIterator. """
+    if any(isinstance(argument, types.GeneratorType) for argument in arguments):
+        arguments = tuple(ReplayableIterator(argument) if isinstance(argument, types.GeneratorType) else argument
+                          for argument in arguments)
+
+    if keyword_arguments and any(isinstance(value, types.GeneratorType) for value in keyword_arguments.values()):
+        keyword_arguments = dict((key, ReplayableIterator(value) if isinstance(value, types.GeneratorType) else value)
+                                 for key, value in keyword_arguments.items())
+
+    return arguments, keyword_arguments
+
+
+def may_have_matched_lost_arguments(recorded_arguments, recorded_keyword_arguments, arguments,
+                                    keyword_arguments):
+    """ Tells whether recorded arguments, of which some have been garbage collected, might have been equal to the
+        given arguments, i.e. whether all of their retained arguments are equal. """
+    if len(recorded_arguments) != len(arguments) or set(recorded_keyword_arguments) != set(keyword_arguments):
+        return False
+
+    pairs = list(zip(recorded_arguments, arguments))
+    pairs.extend((value, keyword_arguments[key]) for key, value in recorded_keyword_arguments.items())
+
+    has_lost_arguments = False
+    for recorded_argument, argument in pairs:
+        if isinstance(recorded_argument, WeakArgument) and recorded_argument._reference() is None:
+            has_lost_arguments = True
+        elif values_differ(recorded_argument, argument):
+            return False
+
+    return has_lost_arguments
+
+
+def matches_recorded_argument(matcher, value):
+    """ Matches an argument of a recorded call, which may have been captured by the argument retention. """
+    if isinstance(value, CapturedArgument):
+        return matcher.matches_captured_argument(value)
+    return matcher.matches(value)
+
+
+def retained_value(value):
+    if isinstance(value, CapturedArgument):
+        return value.retained_value()
+    return value
@@ -0,0 +1,120 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+""" Signatures of patched callables, which map the positional and keyword forms of a call to one canonical form. """
+
+from threading import RLock
+from weakref import WeakKeyDictionary
+
+import inspect
+import types
+
+_signature_of = getattr(inspect, 'signature', None)
+_getattr_static = getattr(inspect, 'getattr_static', None)
+
+
+class TargetSignature(object):
+    """ Binds the arguments of calls to the signature of a patched callable. """
+
+    def __init__(self, signature):
+        self.signature = signature
+        self._minimum_number_of_arguments = 0
+        self._maximum_number_of_arguments = 0
+        self._requires_keyword_arguments = False
+
+        for parameter in signature.parameters.values():
+            kind = parameter.kind
+            if kind == parameter.VAR_POSITIONAL:
+                self._maximum_number_of_arguments = None
+            elif kind == parameter.KEYWORD_ONLY:
+                if parameter.default is parameter.empty:
+                    self._requires_keyword_arguments = True
+            elif kind != parameter.VAR_KEYWORD:
+                if parameter.default is parameter.empty:
+                    self._minimum_number_of_arguments += 1
+                if self._maximum_number_of_arguments is not None:
+                    self._maximum_number_of_arguments += 1
+
+    def canonical_arguments(self, arguments, keyword_arguments):
+        """ Returns the arguments of a call in canonical form. Raises a TypeError if they do not bind. """
+        if not keyword_arguments and not self._requires_keyword_arguments:
+            number_of_arguments = len(arguments)
+            maximum_number_of_arguments = self._maximum_number_of_arguments
+            if number_of_arguments >= self._minimum_number_of_arguments and (
+                    maximum_number_of_arguments is None or number_of_arguments <= maximum_number_of_arguments):
+                return arguments, keyword_arguments
+
+        bound_arguments = self.signature.bind(*arguments, **keyword_arguments)
+        return bound_arguments.args, bound_arguments.kwargs
+
+    def __str__(self):
+        return str(self.signature)
+
+
+def signatures_are_supported():
+    """ Tells whether signatures can be determined, which requires inspect.signature (Python 3.3 or later). """
+    return _signature_of is not None
+
+
+_signatures = WeakKeyDictionary()
+_signatures_lock = RLock()
+
+
+def _create_target_signature(function, drop_first_parameter):
+    try:
+        signature = _signature_of(function)
+    except (TypeError, ValueError):
+        return None
+
+    if drop_first_parameter:
+        parameters = list(signature.parameters.values())
+        if parameters and parameters[0].kind in (parameters[0].POSITIONAL_ONLY, parameters[0].POSITIONAL_OR_KEYWORD):
+            signature = signature.replace(parameters=parameters[1:])
+
+    return TargetSignature(signature)
+
+
+def callable_of_attribute(target, attribute_name, attribute):
+    """ Returns the callable behind the given attribute of the target and whether its first parameter is
+        bound when it is called through the target. """
+    if inspect.ismethod(attribute) and attribute.__self__ is not None:
+        return attribute.__func__, True
+
+    if _getattr_static is not None and isinstance(target, type) and isinstance(
+            _getattr_static(target, attribute_name, None), types.FunctionType):
+        # a function patched on a class is called through instances without self
+        return attribute, True
+
+    return attribute, False
+
+
+def signature_of_callable(function, drop_first_parameter=False):
+    """ Returns the TargetSignature of the given callable, or None if its signature can not be determined. """
+    if _signature_of is None:
+        return None
+
+    with _signatures_lock:
+        try:
+            signatures_of_function = _signatures.get(function)
+        except TypeError:
+            return _create_target_signature(function, drop_first_parameter)
+
+        if signatures_of_function is None:
+            signatures_of_function = _signatures[function] = {}
+
+        if drop_first_parameter not in signatures_of_function:
+            signatures_of_function[drop_first_parameter] = _create_target_signature(function, drop_first_parameter)
+
+        return signatures_of_function[drop_first_parameter]
@@ -0,0 +1,177 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import asyncio
+from unittest import skipIf
+
+from hamcrest import assert_that, ends_with, equal_to
+
+from fluentmock import ANY_VALUES, UnitTests, verify, when
+from fluentmock.exceptions import VerificationError
+
+import targetpackage.asynchronous
+
+
+def run(awaitable):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(awaitable)
+    finally:
+        loop.close()
+
+
+class AsynchronousWhenTests(UnitTests):
+
+    def test_should_return_configured_value_when_awaited(self):
+
+        when(targetpackage.asynchronous).fetch(1).then_return('one')
+
+        actual = run(targetpackage.asynchronous.fetch(1))
+
+        assert_that(actual, equal_to('one'))
+
+    def test_should_return_none_when_awaited_and_not_configured(self):
+
+        when(targetpackage.asynchronous).fetch(1).then_return('one')
+
+        actual = run(targetpackage.asynchronous.fetch(2))
+
+        assert_that(actual, equal_to(None))
+
+    def test_should_answer_in_order_of_calls(self):
+
+        when(targetpackage.asynchronous).fetch(1).then_return('first').then_return('second')
+
+        actual = run(targetpackage.asynchronous.fetch_twice(1))
+
+        assert_that(actual, equal_to(('first', 'second')))
+
+    def test_should_raise_configured_exception_when_awaited(self):
+
+        when(targetpackage.asynchronous).fetch(1).then_raise(ValueError('spam'))
+
+        awaitable = targetpackage.asynchronous.fetch(1)
+
+        self.assertRaises(ValueError, run, awaitable)
+
+    def test_should_return_result_of_awaitable(self):
+
+        async def produce():
+            return 'produced'
+
+        when(targetpackage.asynchronous).fetch(1).then_await(produce)
+
+        actual = run(targetpackage.asynchronous.fetch(1))
+
+        assert_that(actual, equal_to('produced'))
+
+    def test_should_return_value_after_delay_on_event_loop(self):
+
+        when(targetpackage.asynchronous).fetch(1).then_delay(0.01, 'delayed')
+
+        async def measure():
+            loop = asyncio.get_event_loop()
+            started = loop.time()
+            result = await targetpackage.asynchronous.fetch(1)
+            return result, loop.time() - started
+
+        actual, elapsed = run(measure())
+
+        assert_that(actual, equal_to('delayed'))
+        assert_that(elapsed >= 0.01)
+
+    def test_should_return_coroutine_which_can_be_run_as_task(self):
+
+        when(targetpackage.asynchronous).fetch(1).then_return('one')
+
+        async def fetch_in_task():
+            return await asyncio.ensure_future(targetpackage.asynchronous.fetch(1))
+
+        assert_that(run(fetch_in_task()), equal_to('one'))
+        verify(targetpackage.asynchronous).fetch.awaited(1)
+
+    @skipIf(not hasattr(asyncio, 'create_task'), 'asyncio.create_task requires Python 3.7')
+    def test_should_return_coroutine_which_can_be_passed_to_create_task(self):
+
+        when(targetpackage.asynchronous).fetch(ANY_VALUES).then_return('fetched')
+
+        async def fetch_concurrently():
+            tasks = [asyncio.create_task(targetpackage.asynchronous.fetch(identifier)) for identifier in range(3)]
+            return await asyncio.gather(*tasks)
+
+        assert_that(run(fetch_concurrently()), equal_to(['fetched', 'fetched', 'fetched']))
+        verify(targetpackage.asynchronous, times=3).fetch.awaited(ANY_VALUES)
+
+    @skipIf(not hasattr(asyncio, 'run'), 'asyncio.run requires Python 3.7')
+    def test_should_return_coroutine_which_can_be_run_by_asyncio(self):
+
+        when(targetpackage.asynchronous).fetch(1).then_return('one')
+
+        assert_that(asyncio.run(targetpackage.asynchronous.fetch(1)), equal_to('one'))
+
+
+class AsynchronousVerifyTests(UnitTests):
+
+    def test_should_verify_awaited_call(self):
+
+        when(targetpackage.asynchronous).fetch(ANY_VALUES).then_return('one')
+
+        run(targetpackage.asynchronous.fetch(1))
+
+        verify(targetpackage.asynchronous).fetch.awaited(1)
+
+    def test_should_verify_call_which_has_not_been_awaited(self):
+
+        when(targetpackage.asynchronous).fetch(ANY_VALUES).then_return('one')
+
+        targetpackage.asynchronous.fetch(1).close()
+
+        verify(targetpackage.asynchronous).fetch(1)
+
+    def test_should_raise_error_when_call_has_not_been_awaited(self):
+
+        when(targetpackage.asynchronous).fetch(ANY_VALUES).then_return('one')
+
+        targetpackage.asynchronous.fetch(1).close()
+
+        exception_raised = False
+        try:
+            verify(targetpackage.asynchronous).fetch.awaited(1)
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), equal_to("""
+Expected: call targetpackage.asynchronous.fetch(1) << at least once >>
+  Reason: No call of the patched function has been awaited.
+"""))
+
+        assert_that(exception_raised)
+
+    def test_should_list_awaited_calls_when_expected_call_has_not_been_awaited(self):
+
+        when(targetpackage.asynchronous).fetch(ANY_VALUES).then_return('one')
+
+        run(targetpackage.asynchronous.fetch(2))
+        targetpackage.asynchronous.fetch(1).close()
+
+        exception_raised = False
+        try:
+            verify(targetpackage.asynchronous, times=1).fetch.awaited(1)
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), ends_with("""
+ but was: call targetpackage.asynchronous.fetch(2)
+"""))
+
+        assert_that(exception_raised)
@@ -14,8 +14,16 @@
 #   limitations under the License.
 
 from mock import Mock
-from hamcrest import assert_that, equal_to, instance_of
-from fluentmock import UnitTests, create_mock
+from hamcrest import assert_that, equal_to, instance_of, is_not, same_instance
+from fluentmock import MockFactory, UnitTests, create_mock, mock_factory
+
+
+class SpecificationClass(object):
+
+    spam = 'eggs'
+
+    def some_method(self, value):
+        pass
 
 
 class CreateMockTests(UnitTests):
@@ -65,3 +73,78 @@ class CreateMockTests(UnitTests):
         assert_that(actual, instance_of(SpecificationClass))
         assert_that(actual.bar, equal_to('foo'))
         assert_that(actual.eggs, equal_to('spam'))
+
+    def test_should_create_mock_using_given_specification_instance(self):
+
+        actual = create_mock(SpecificationClass())
+
+        assert_that(actual, instance_of(SpecificationClass))
+        self.assertRaises(AttributeError, getattr, actual, 'unknown_attribute')
+
+
+class MockFactoryTests(UnitTests):
+
+    def test_should_return_mock_factory(self):
+
+        actual = mock_factory(SpecificationClass)
+
+        assert_that(actual, instance_of(MockFactory))
+
+    def test_should_return_the_same_factory_for_the_same_specification(self):
+
+        actual = mock_factory(SpecificationClass)
+
+        assert_that(actual, same_instance(mock_factory(SpecificationClass)))
+        assert_that(actual, is_not(same_instance(mock_factory(SpecificationClass, spec_set=True))))
+
+    def test_should_create_mocks_of_specification(self):
+
+        factory = MockFactory(SpecificationClass)
+
+        first_mock = factory()
+        second_mock = factory()
+
+        assert_that(first_mock, instance_of(SpecificationClass))
+        assert_that(second_mock, instance_of(SpecificationClass))
+        assert_that(first_mock, is_not(same_instance(second_mock)))
+
+    def test_should_not_allow_attributes_missing_in_specification(self):
+
+        factory = MockFactory(SpecificationClass)
+        factory()
+
+        actual = factory()
+
+        self.assertRaises(AttributeError, getattr, actual, 'unknown_attribute')
+
+    def test_should_create_independent_children(self):
+
+        factory = MockFactory(SpecificationClass)
+        first_mock = factory()
+        second_mock = factory()
+
+        first_mock.some_method(1)
+
+        assert_that(first_mock.some_method.call_count, equal_to(1))
+        assert_that(second_mock.some_method.call_count, equal_to(0))
+
+    def test_should_create_mock_with_properties(self):
+
+        factory = MockFactory(SpecificationClass)
+        factory(spam='bacon')
+
+        actual = factory(spam='eggs', foo='bar')
+
+        assert_that(actual.spam, equal_to('eggs'))
+        assert_that(actual.foo, equal_to('bar'))
+
+    def test_should_not_allow_setting_attributes_missing_in_restricted_specification(self):
+
+        factory = MockFactory(SpecificationClass, spec_set=True)
+        factory()
+
+        actual = factory()
+        actual.spam = 'bacon'
+
+        assert_that(actual.spam, equal_to('bacon'))
+        self.assertRaises(AttributeError, setattr, actual, 'foo', 'bar')
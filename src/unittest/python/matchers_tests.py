@@ -13,8 +13,16 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from fluentmock import UnitTests
-from fluentmock.matchers import (AtLeastOnceMatcher,
+import re
+from unittest import skipIf
+
+from fluentmock import ANY_INTEGER, ANY_LIST, ANY_STRING, NEVER, UnitTests, verify, when
+from fluentmock.matchers import (AllOfMatcher,
+                                 ArrayShapeMatcher,
+                                 AnyMatcher,
+                                 AtLeastOnceMatcher,
+                                 AnyInRangeMatcher,
+                                 AnyOfMatcher,
                                  AnyValueMatcher,
                                  AnyValuesMatcher,
                                  AnyValueOfTypeMatcher,
@@ -22,13 +30,34 @@ from fluentmock.matchers import (AtLeastOnceMatcher,
                                  FluentMatcher,
                                  ListContainsMatcher,
                                  NeverMatcher,
+                                 NotMatcher,
                                  TimesMatcher,
                                  a_list_containing,
+                                 all_elements_match,
+                                 all_of,
+                                 an_iterable_containing,
+                                 any_element_matches,
                                  any_value_of_type,
+                                 any_in_range,
                                  any_of,
-                                 contains)
+                                 any_of_set,
+                                 array_close_to,
+                                 array_equal_to,
+                                 array_of_shape,
+                                 buffer_equal_to,
+                                 contains,
+                                 contains_all,
+                                 contains_any,
+                                 either,
+                                 has_length,
+                                 matches_regex,
+                                 not_,
+                                 numpy,
+                                 values_differ)
 from fluentmock.exceptions import MatcherException
-from hamcrest import assert_that, equal_to, instance_of
+from hamcrest import assert_that, equal_to, instance_of, same_instance
+
+import targetpackage
 
 
 class FluentMatcherTests(UnitTests):
@@ -335,6 +364,197 @@ class AnyOfMatcherTests(UnitTests):
 
         assert_that(str(matcher), equal_to('<< Any value in [1, 2, 3] >>'))
 
+    def test_should_return_true_when_matching_unhashable_element(self):
+
+        matcher = any_of(1, [2, 3], {'spam': 'eggs'})
+
+        assert_that(matcher.matches([2, 3]), equal_to(True))
+        assert_that(matcher.matches({'spam': 'eggs'}), equal_to(True))
+        assert_that(matcher.matches(1), equal_to(True))
+
+    def test_should_return_false_when_unhashable_value_is_not_an_element(self):
+
+        matcher = any_of(1, 2, [3])
+
+        assert_that(matcher.matches([1]), equal_to(False))
+        assert_that(matcher.matches(3), equal_to(False))
+
+    def test_should_return_true_when_value_is_equal_to_an_element(self):
+
+        matcher = any_of(1, 2)
+
+        assert_that(matcher.matches(2.0), equal_to(True))
+
+
+class AnyOfSetTests(UnitTests):
+
+    def test_should_return_any_of_matcher(self):
+
+        matcher = any_of_set(range(10000))
+
+        assert_that(matcher, instance_of(AnyOfMatcher))
+
+    def test_should_raise_exception_when_no_element_is_given(self):
+
+        self.assertRaises(MatcherException, any_of_set, [])
+
+    def test_should_return_true_when_value_is_an_element(self):
+
+        matcher = any_of_set(set(['spam', 'eggs']))
+
+        assert_that(matcher.matches('eggs'), equal_to(True))
+
+    def test_should_return_false_when_value_is_not_an_element(self):
+
+        matcher = any_of_set(range(10000))
+
+        assert_that(matcher.matches(10000), equal_to(False))
+
+
+class AnyInRangeMatcherTests(UnitTests):
+
+    def test_should_raise_exception_when_range_is_empty(self):
+
+        self.assertRaises(MatcherException, AnyInRangeMatcher, 2, 2)
+
+    def test_should_return_true_when_value_is_the_lower_bound(self):
+
+        matcher = AnyInRangeMatcher(0, 10)
+
+        assert_that(matcher.matches(0), equal_to(True))
+
+    def test_should_return_false_when_value_is_the_upper_bound(self):
+
+        matcher = AnyInRangeMatcher(0, 10)
+
+        assert_that(matcher.matches(10), equal_to(False))
+
+    def test_should_return_true_when_value_is_within_range(self):
+
+        matcher = AnyInRangeMatcher(0, 10)
+
+        assert_that(matcher.matches(9.5), equal_to(True))
+
+    def test_should_return_false_when_value_is_not_comparable(self):
+
+        matcher = AnyInRangeMatcher(0, 10)
+
+        assert_that(matcher.matches(None), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = any_in_range(0, 10)
+
+        assert_that(str(matcher), equal_to('<< Any value in range [0, 10) >>'))
+
+
+class MatchesRegexTests(UnitTests):
+
+    def test_should_return_true_when_string_matches_pattern(self):
+
+        matcher = matches_regex(r'SELECT .* FROM users')
+
+        assert_that(matcher.matches('SELECT id, name FROM users WHERE id = 1'), equal_to(True))
+
+    def test_should_return_false_when_string_does_not_match_pattern(self):
+
+        matcher = matches_regex(r'^DELETE')
+
+        assert_that(matcher.matches('SELECT 1'), equal_to(False))
+
+    def test_should_accept_compiled_pattern(self):
+
+        matcher = matches_regex(re.compile('error', re.IGNORECASE))
+
+        assert_that(matcher.matches('An ERROR occurred'), equal_to(True))
+
+    def test_should_return_false_when_value_is_not_a_string(self):
+
+        matcher = matches_regex('1')
+
+        assert_that(matcher.matches(1), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = matches_regex('^spam$')
+
+        assert_that(str(matcher), equal_to('<< a string matching "^spam$" >>'))
+
+
+class ContainsAnyTests(UnitTests):
+
+    def test_should_raise_exception_when_no_substring_is_given(self):
+
+        self.assertRaises(MatcherException, contains_any)
+
+    def test_should_return_true_when_string_contains_one_of_the_substrings(self):
+
+        matcher = contains_any('WARNING', 'ERROR', 'a.b')
+
+        assert_that(matcher.matches('2015-01-01 ERROR something failed'), equal_to(True))
+        assert_that(matcher.matches('a.b'), equal_to(True))
+
+    def test_should_return_false_when_string_contains_none_of_the_substrings(self):
+
+        matcher = contains_any('WARNING', 'ERROR', 'a.b')
+
+        assert_that(matcher.matches('2015-01-01 INFO axb'), equal_to(False))
+
+    def test_should_return_false_when_value_is_not_a_string(self):
+
+        matcher = contains_any('1')
+
+        assert_that(matcher.matches(None), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = contains_any('spam', 'eggs')
+
+        assert_that(str(matcher), equal_to("<< a string containing any of ['spam', 'eggs'] >>"))
+
+
+class ContainsAllTests(UnitTests):
+
+    def test_should_raise_exception_when_no_substring_is_given(self):
+
+        self.assertRaises(MatcherException, contains_all)
+
+    def test_should_return_true_when_string_contains_all_substrings(self):
+
+        matcher = contains_all('FROM users', 'SELECT', 'WHERE')
+
+        assert_that(matcher.matches('SELECT * FROM users WHERE id = 1'), equal_to(True))
+
+    def test_should_return_false_when_one_substring_is_missing(self):
+
+        matcher = contains_all('FROM users', 'SELECT', 'LIMIT')
+
+        assert_that(matcher.matches('SELECT * FROM users WHERE id = 1'), equal_to(False))
+
+    def test_should_find_overlapping_substrings(self):
+
+        matcher = contains_all('spam', 'pame', 'ame')
+
+        assert_that(matcher.matches('spamelot'), equal_to(True))
+
+    def test_should_find_substrings_starting_at_the_same_position(self):
+
+        matcher = contains_all('spa', 'spam')
+
+        assert_that(matcher.matches('spam'), equal_to(True))
+
+    def test_should_return_false_when_value_is_not_a_string(self):
+
+        matcher = contains_all('1')
+
+        assert_that(matcher.matches(1), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = contains_all('spam', 'eggs')
+
+        assert_that(str(matcher), equal_to("<< a string containing all of ['spam', 'eggs'] >>"))
+
 
 class ListContainsTests(UnitTests):
 
@@ -369,6 +589,167 @@ class ListContainsTests(UnitTests):
         assert_that(str(matcher), equal_to("<< a list containing element 'foo' >>"))
 
 
+class AnIterableContainingTests(UnitTests):
+
+    def test_should_return_true_when_set_contains_element(self):
+
+        matcher = an_iterable_containing('spam')
+
+        assert_that(matcher.matches(set(['spam', 'eggs'])), equal_to(True))
+
+    def test_should_return_true_when_dictionary_contains_key(self):
+
+        matcher = an_iterable_containing('spam')
+
+        assert_that(matcher.matches({'spam': 'eggs'}), equal_to(True))
+
+    def test_should_return_true_when_generator_contains_element(self):
+
+        matcher = an_iterable_containing(3)
+
+        assert_that(matcher.matches(number for number in range(10)), equal_to(True))
+
+    def test_should_return_true_when_memoryview_contains_element(self):
+
+        matcher = an_iterable_containing(memoryview(b'spam')[0])
+
+        assert_that(matcher.matches(memoryview(b'spam')), equal_to(True))
+
+    def test_should_stop_at_the_first_matching_element(self):
+
+        numbers = iter(range(10))
+        matcher = an_iterable_containing(3)
+
+        matcher.matches(numbers)
+
+        assert_that(next(numbers), equal_to(4))
+
+    def test_should_return_true_when_set_contains_unhashable_element(self):
+
+        matcher = an_iterable_containing([1])
+
+        assert_that(matcher.matches(([2], [1])), equal_to(True))
+
+    def test_should_return_false_when_iterable_does_not_contain_element(self):
+
+        matcher = an_iterable_containing('bacon')
+
+        assert_that(matcher.matches(('spam', 'eggs')), equal_to(False))
+
+    def test_should_return_false_when_value_is_not_iterable(self):
+
+        matcher = an_iterable_containing(1)
+
+        assert_that(matcher.matches(1), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = an_iterable_containing('spam')
+
+        assert_that(str(matcher), equal_to("<< an iterable containing element 'spam' >>"))
+
+
+class AllElementsMatchTests(UnitTests):
+
+    def test_should_raise_exception_when_value_is_not_a_matcher(self):
+
+        self.assertRaises(MatcherException, all_elements_match, 1)
+
+    def test_should_return_true_when_all_elements_match(self):
+
+        matcher = all_elements_match(ANY_INTEGER)
+
+        assert_that(matcher.matches(number for number in range(10)), equal_to(True))
+
+    def test_should_return_false_and_stop_when_one_element_does_not_match(self):
+
+        values = iter([1, 'spam', 2])
+        matcher = all_elements_match(ANY_INTEGER)
+
+        assert_that(matcher.matches(values), equal_to(False))
+        assert_that(next(values), equal_to(2))
+
+    def test_should_return_false_when_value_is_not_iterable(self):
+
+        matcher = all_elements_match(ANY_INTEGER)
+
+        assert_that(matcher.matches(1), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = all_elements_match(ANY_INTEGER)
+
+        assert_that(str(matcher), equal_to('<< an iterable with all elements matching Any value of type "int" >>'))
+
+
+class AnyElementMatchesTests(UnitTests):
+
+    def test_should_raise_exception_when_value_is_not_a_matcher(self):
+
+        self.assertRaises(MatcherException, any_element_matches, 1)
+
+    def test_should_return_true_and_stop_when_one_element_matches(self):
+
+        values = iter(['spam', 1, 'eggs'])
+        matcher = any_element_matches(ANY_INTEGER)
+
+        assert_that(matcher.matches(values), equal_to(True))
+        assert_that(next(values), equal_to('eggs'))
+
+    def test_should_return_false_when_no_element_matches(self):
+
+        matcher = any_element_matches(ANY_INTEGER)
+
+        assert_that(matcher.matches(['spam', 'eggs']), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = any_element_matches(contains('spam'))
+
+        assert_that(str(matcher), equal_to('<< an iterable with an element matching a string containing "spam" >>'))
+
+
+class HasLengthTests(UnitTests):
+
+    def test_should_return_true_when_length_is_equal(self):
+
+        matcher = has_length(3)
+
+        assert_that(matcher.matches([1, 2, 3]), equal_to(True))
+
+    def test_should_return_false_when_length_is_not_equal(self):
+
+        matcher = has_length(3)
+
+        assert_that(matcher.matches('spam'), equal_to(False))
+
+    def test_should_count_elements_of_iterable_without_length(self):
+
+        matcher = has_length(3)
+
+        assert_that(matcher.matches(number for number in range(3)), equal_to(True))
+
+    def test_should_stop_counting_when_iterable_is_too_long(self):
+
+        numbers = iter(range(10))
+        matcher = has_length(3)
+
+        assert_that(matcher.matches(numbers), equal_to(False))
+        assert_that(next(numbers), equal_to(4))
+
+    def test_should_return_false_when_value_is_not_iterable(self):
+
+        matcher = has_length(1)
+
+        assert_that(matcher.matches(1), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = has_length(3)
+
+        assert_that(str(matcher), equal_to('<< an iterable of length 3 >>'))
+
+
 class AListContainingTests(UnitTests):
 
     def test_should_return_list_contains_matcher(self):
@@ -388,3 +769,323 @@ class AListContainingTests(UnitTests):
         matcher = a_list_containing('bar')
 
         assert_that(matcher.matches(['foo', 'spam']), equal_to(False))
+
+
+class RecordingMatcher(FluentMatcher):
+
+    def __init__(self, name, result, cost, evaluated_matchers):
+        self._name = name
+        self._result = result
+        self.cost = cost
+        self._evaluated_matchers = evaluated_matchers
+
+    def matches(self, value):
+        self._evaluated_matchers.append(self._name)
+        return self._result
+
+    def __repr__(self):
+        return self._matcher_string(self._name)
+
+
+class AllOfMatcherTests(UnitTests):
+
+    def test_should_raise_exception_when_no_matcher_is_given(self):
+
+        self.assertRaises(MatcherException, all_of)
+
+    def test_should_raise_exception_when_value_is_not_a_matcher(self):
+
+        self.assertRaises(MatcherException, all_of, ANY_STRING, 'spam')
+
+    def test_should_return_true_when_all_matchers_match(self):
+
+        matcher = all_of(ANY_STRING, contains('spam'))
+
+        assert_that(matcher.matches('spam and eggs'), equal_to(True))
+
+    def test_should_return_false_when_one_matcher_does_not_match(self):
+
+        matcher = ANY_STRING & contains('bacon')
+
+        assert_that(matcher.matches('spam and eggs'), equal_to(False))
+
+    def test_should_check_the_type_before_searching(self):
+
+        matcher = all_of(a_list_containing('spam'), ANY_LIST)
+
+        assert_that(matcher.matches('spam'), equal_to(False))
+
+    def test_should_evaluate_cheapest_matcher_first_and_stop_at_first_mismatch(self):
+
+        evaluated_matchers = []
+        expensive = RecordingMatcher('expensive', True, 3, evaluated_matchers)
+        cheap = RecordingMatcher('cheap', False, 1, evaluated_matchers)
+
+        matcher = all_of(expensive, cheap)
+
+        assert_that(matcher.matches('spam'), equal_to(False))
+        assert_that(evaluated_matchers, equal_to(['cheap']))
+
+    def test_should_flatten_nested_matchers(self):
+
+        matcher = ANY_STRING & contains('spam') & contains('eggs')
+
+        assert_that(matcher, instance_of(AllOfMatcher))
+        assert_that(len(matcher.matchers), equal_to(3))
+
+    def test_should_return_string_representation(self):
+
+        matcher = all_of(ANY_STRING, contains('spam'))
+
+        assert_that(str(matcher), equal_to('<< (Any value of type "str" and a string containing "spam") >>'))
+
+
+class EitherTests(UnitTests):
+
+    def test_should_raise_exception_when_no_matcher_is_given(self):
+
+        self.assertRaises(MatcherException, either)
+
+    def test_should_return_true_when_one_matcher_matches(self):
+
+        matcher = either(ANY_INTEGER, contains('spam'))
+
+        assert_that(matcher.matches(1), equal_to(True))
+
+    def test_should_return_false_when_no_matcher_matches(self):
+
+        matcher = ANY_INTEGER | ANY_LIST
+
+        assert_that(matcher.matches('spam'), equal_to(False))
+
+    def test_should_evaluate_cheapest_matcher_first_and_stop_at_first_match(self):
+
+        evaluated_matchers = []
+        expensive = RecordingMatcher('expensive', True, 3, evaluated_matchers)
+        cheap = RecordingMatcher('cheap', True, 1, evaluated_matchers)
+
+        matcher = either(expensive, cheap)
+
+        assert_that(matcher.matches('spam'), equal_to(True))
+        assert_that(evaluated_matchers, equal_to(['cheap']))
+
+    def test_should_flatten_nested_matchers(self):
+
+        matcher = ANY_INTEGER | ANY_LIST | (ANY_STRING & contains('spam'))
+
+        assert_that(matcher, instance_of(AnyMatcher))
+        assert_that(len(matcher.matchers), equal_to(3))
+
+    def test_should_return_string_representation(self):
+
+        matcher = either(ANY_INTEGER, any_of(1, 2))
+
+        assert_that(str(matcher), equal_to('<< (Any value of type "int" or Any value in [1, 2]) >>'))
+
+
+class NotMatcherTests(UnitTests):
+
+    def test_should_raise_exception_when_value_is_not_a_matcher(self):
+
+        self.assertRaises(MatcherException, not_, 'spam')
+
+    def test_should_return_false_when_matcher_matches(self):
+
+        matcher = not_(ANY_STRING)
+
+        assert_that(matcher.matches('spam'), equal_to(False))
+
+    def test_should_return_true_when_matcher_does_not_match(self):
+
+        matcher = ~ANY_STRING
+
+        assert_that(matcher, instance_of(NotMatcher))
+        assert_that(matcher.matches(1), equal_to(True))
+
+    def test_should_remove_double_negation(self):
+
+        matcher = not_(~ANY_STRING)
+
+        assert_that(matcher, same_instance(ANY_STRING))
+
+    def test_should_return_string_representation(self):
+
+        matcher = not_(contains('spam'))
+
+        assert_that(str(matcher), equal_to('<< not a string containing "spam" >>'))
+
+
+class AmbiguousComparison(object):
+
+    def __bool__(self):
+        raise ValueError('The truth value of an array with more than one element is ambiguous.')
+
+    __nonzero__ = __bool__
+
+
+class AmbiguousBuffer(bytearray):
+
+    def __eq__(self, other):
+        return AmbiguousComparison()
+
+    def __ne__(self, other):
+        return AmbiguousComparison()
+
+
+class ValuesDifferTests(UnitTests):
+
+    def test_should_return_false_when_values_are_equal(self):
+
+        assert_that(values_differ('spam', 'spam'), equal_to(False))
+
+    def test_should_return_true_when_values_differ(self):
+
+        assert_that(values_differ('spam', 'eggs'), equal_to(True))
+
+    def test_should_compare_arrays_with_ambiguous_comparison_as_a_whole(self):
+
+        assert_that(values_differ(AmbiguousBuffer(b'spam'), AmbiguousBuffer(b'spam')), equal_to(False))
+        assert_that(values_differ(AmbiguousBuffer(b'spam'), AmbiguousBuffer(b'eggs')), equal_to(True))
+
+    def test_should_answer_and_verify_calls_with_arrays_with_ambiguous_comparison(self):
+
+        when(targetpackage).targetfunction(AmbiguousBuffer(b'spam')).then_return('spam')
+        when(targetpackage).targetfunction(AmbiguousBuffer(b'eggs')).then_return('eggs')
+
+        assert_that(targetpackage.targetfunction(AmbiguousBuffer(b'spam')), equal_to('spam'))
+
+        verify(targetpackage).targetfunction(AmbiguousBuffer(b'spam'))
+        verify(targetpackage, NEVER).targetfunction(AmbiguousBuffer(b'eggs'))
+        verify(targetpackage).targetfunction(buffer_equal_to(b'spam'))
+
+
+class BufferEqualToTests(UnitTests):
+
+    def test_should_raise_exception_when_expected_value_is_not_a_buffer(self):
+
+        self.assertRaises(MatcherException, buffer_equal_to, 'spam' if bytes is not str else 1)
+
+    def test_should_return_true_when_buffers_are_equal(self):
+
+        matcher = buffer_equal_to(b'spam' * 1000)
+
+        assert_that(matcher.matches(bytearray(b'spam' * 1000)), equal_to(True))
+
+    def test_should_compare_memoryview_slices(self):
+
+        matcher = buffer_equal_to(b'am')
+
+        assert_that(matcher.matches(memoryview(b'spam')[2:]), equal_to(True))
+        assert_that(matcher.matches(memoryview(b'spam')[1:3]), equal_to(False))
+
+    def test_should_return_false_when_buffers_have_different_sizes(self):
+
+        matcher = buffer_equal_to(b'spam')
+
+        assert_that(matcher.matches(b'spa'), equal_to(False))
+
+    def test_should_return_false_when_value_is_not_a_buffer(self):
+
+        matcher = buffer_equal_to(b'1')
+
+        assert_that(matcher.matches(1), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = buffer_equal_to(b'spam')
+
+        assert_that(str(matcher), equal_to("<< a buffer of 4 bytes equal to %r >>" % b'spam'))
+
+
+class ArrayOfShapeTests(UnitTests):
+
+    def test_should_return_array_shape_matcher(self):
+
+        assert_that(array_of_shape((2, 3)), instance_of(ArrayShapeMatcher))
+
+    def test_should_return_true_when_memoryview_has_shape(self):
+
+        matcher = array_of_shape(4)
+
+        assert_that(matcher.matches(memoryview(b'spam')), equal_to(True))
+
+    def test_should_return_false_when_shape_differs(self):
+
+        matcher = array_of_shape((2, 2))
+
+        assert_that(matcher.matches(memoryview(b'spam')), equal_to(False))
+
+    def test_should_return_false_when_value_has_no_shape(self):
+
+        matcher = array_of_shape((4,))
+
+        assert_that(matcher.matches('spam'), equal_to(False))
+
+    def test_should_return_string_representation(self):
+
+        matcher = array_of_shape((2, 3))
+
+        assert_that(str(matcher), equal_to('<< an array of shape (2, 3) >>'))
+
+
+class ArrayEqualToTests(UnitTests):
+
+    def test_should_return_true_when_buffers_are_equal(self):
+
+        matcher = array_equal_to(bytearray(b'spam'))
+
+        assert_that(matcher.matches(memoryview(b'spam')), equal_to(True))
+
+    def test_should_return_false_when_buffers_differ(self):
+
+        matcher = array_equal_to(bytearray(b'spam'))
+
+        assert_that(matcher.matches(b'eggs'), equal_to(False))
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_should_return_true_when_arrays_are_equal(self):
+
+        matcher = array_equal_to([[1, 2], [3, 4]])
+
+        assert_that(matcher.matches(numpy.array([[1, 2], [3, 4]])), equal_to(True))
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_should_return_false_when_arrays_have_different_shapes(self):
+
+        matcher = array_equal_to([1, 2, 3, 4])
+
+        assert_that(matcher.matches(numpy.array([[1, 2], [3, 4]])), equal_to(False))
+
+    @skipIf(numpy is not None, 'numpy is installed')
+    def test_should_raise_exception_when_expected_value_is_not_a_buffer_and_numpy_is_missing(self):
+
+        self.assertRaises(MatcherException, array_equal_to, [1, 2, 3])
+
+
+class ArrayCloseToTests(UnitTests):
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_should_return_true_when_arrays_are_close(self):
+
+        matcher = array_close_to([1.0, 2.0], atol=0.01)
+
+        assert_that(matcher.matches(numpy.array([1.001, 1.999])), equal_to(True))
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_should_return_false_when_arrays_are_not_close(self):
+
+        matcher = array_close_to([1.0, 2.0], atol=0.01)
+
+        assert_that(matcher.matches(numpy.array([1.1, 2.0])), equal_to(False))
+
+    @skipIf(numpy is None, 'numpy is not installed')
+    def test_should_return_false_when_arrays_have_different_shapes(self):
+
+        matcher = array_close_to([1.0, 1.0])
+
+        assert_that(matcher.matches(numpy.array([1.0])), equal_to(False))
+
+    @skipIf(numpy is not None, 'numpy is installed')
+    def test_should_raise_exception_when_numpy_is_missing(self):
+
+        self.assertRaises(MatcherException, array_close_to, [1.0, 2.0])
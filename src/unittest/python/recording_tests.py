@@ -0,0 +1,193 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import gc
+from weakref import ref
+
+from hamcrest import assert_that, ends_with, equal_to
+from mock import Mock
+
+from fluentmock import (ANY_FLOAT,
+                        ANY_INTEGER,
+                        ANY_STRING,
+                        ANY_VALUES,
+                        NEVER,
+                        RECORD_COUNTS,
+                        RECORD_NOTHING,
+                        UnitTests,
+                        expect,
+                        get_registry,
+                        record_last,
+                        set_recording_policy,
+                        verify,
+                        verify_all,
+                        when)
+from fluentmock.exceptions import VerificationError
+
+import targetpackage
+
+
+class RecordCountsTests(UnitTests):
+
+    def test_should_verify_literal_arguments(self):
+
+        when(targetpackage, recording=RECORD_COUNTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction(2, hello='world')
+
+        verify(targetpackage, times=2).targetfunction(1)
+        verify(targetpackage, times=1).targetfunction(2, hello='world')
+        verify(targetpackage, times=3).targetfunction(ANY_VALUES)
+        verify(targetpackage, NEVER).targetfunction(3)
+
+    def test_should_not_retain_call_entries(self):
+
+        when(targetpackage, recording=RECORD_COUNTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(1)
+
+        assert_that(get_registry().call_entries, equal_to([]))
+
+    def test_should_verify_with_matchers_by_counts_of_distinct_signatures(self):
+
+        when(targetpackage, recording=RECORD_COUNTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction(2, hello='world')
+        targetpackage.targetfunction('spam')
+
+        verify(targetpackage, times=2).targetfunction(ANY_INTEGER)
+        verify(targetpackage, times=1).targetfunction(ANY_INTEGER, hello=ANY_STRING)
+        verify(targetpackage, times=1).targetfunction(ANY_STRING)
+        verify(targetpackage, NEVER).targetfunction(ANY_FLOAT)
+
+    def test_should_raise_error_when_verifying_with_matchers_after_calls_with_unhashable_arguments(self):
+
+        when(targetpackage, recording=RECORD_COUNTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction([1])
+
+        exception_raised = False
+        try:
+            verify(targetpackage).targetfunction(ANY_INTEGER)
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), ends_with("""
+  Reason: The calls have been recorded retaining only counts per argument signature, \
+which is not enough to verify this.
+"""))
+
+        assert_that(exception_raised)
+
+    def test_should_verify_literal_arguments_using_verify_all(self):
+
+        when(targetpackage, recording=RECORD_COUNTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(1)
+
+        verify_all(expect(targetpackage).targetfunction(1),
+                   expect(targetpackage, NEVER).targetfunction(2))
+
+
+class RecordLastTests(UnitTests):
+
+    def test_should_verify_with_matchers_when_no_call_has_been_dropped(self):
+
+        when(targetpackage, recording=record_last(3)).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction(2)
+
+        verify(targetpackage, times=2).targetfunction(ANY_INTEGER)
+
+    def test_should_raise_error_when_calls_have_been_dropped(self):
+
+        when(targetpackage, recording=record_last(3)).targetfunction(ANY_VALUES).then_return(1)
+
+        for number in range(5):
+            targetpackage.targetfunction(number)
+
+        exception_raised = False
+        try:
+            verify(targetpackage).targetfunction(1)
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), ends_with("""
+  Reason: The calls have been recorded retaining only the last 3 calls, which is not enough to verify this.
+"""))
+
+        assert_that(exception_raised)
+
+    def test_should_count_all_calls_when_verifying_any_values(self):
+
+        when(targetpackage, recording=record_last(3)).targetfunction(ANY_VALUES).then_return(1)
+
+        for number in range(5):
+            targetpackage.targetfunction(number)
+
+        verify(targetpackage, times=5).targetfunction(ANY_VALUES)
+
+    def test_should_list_the_retained_calls(self):
+
+        when(targetpackage, recording=record_last(2)).targetfunction(ANY_VALUES).then_return(1)
+
+        for number in range(5):
+            targetpackage.targetfunction(number)
+
+        exception_raised = False
+        try:
+            verify(targetpackage, NEVER).targetfunction(ANY_VALUES)
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), ends_with("""
+ but was: call targetpackage.targetfunction(3)
+          call targetpackage.targetfunction(4)
+"""))
+
+        assert_that(exception_raised)
+
+
+class RecordNothingTests(UnitTests):
+
+    def test_should_count_calls(self):
+
+        set_recording_policy(RECORD_NOTHING)
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction(2)
+
+        verify(targetpackage, times=2).targetfunction(ANY_VALUES)
+        self.assertRaises(VerificationError, verify(targetpackage).targetfunction, 1)
+
+    def test_should_not_keep_arguments_of_calls_alive(self):
+
+        class Argument(object):
+            pass
+
+        when(targetpackage, recording=RECORD_NOTHING).targetfunction(ANY_VALUES).then_return(1)
+
+        argument = Argument()
+        argument_reference = ref(argument)
+        targetpackage.targetfunction(argument)
+        del argument
+        gc.collect()
+
+        assert_that(argument_reference(), equal_to(None))
+        assert_that(isinstance(targetpackage.targetfunction, Mock), equal_to(False))
@@ -0,0 +1,150 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from threading import Thread
+from unittest import TestCase, TestResult
+
+from hamcrest import assert_that, equal_to, is_not, same_instance
+from mock import Mock
+
+import fluentmock
+from fluentmock import (ANY_VALUE,
+                        FluentRegistry,
+                        UnitTests,
+                        get_patches,
+                        get_registry,
+                        undo_patches,
+                        verify,
+                        when)
+
+import targetpackage
+
+
+class RegistryTests(UnitTests):
+
+    def test_should_use_a_registry_of_its_own_for_each_test(self):
+
+        assert_that(get_registry(), is_not(same_instance(fluentmock._default_registry)))
+
+    def test_should_register_patches_in_registry_of_the_test(self):
+
+        when(targetpackage).targetfunction().then_return(1)
+
+        assert_that(get_patches(), same_instance(get_registry().patch_entries))
+        assert_that(len(get_patches()), equal_to(1))
+
+    def test_should_record_calls_from_worker_threads(self):
+
+        when(targetpackage).targetfunction(ANY_VALUE).then_return(1)
+
+        def call_target_function():
+            for number in range(100):
+                targetpackage.targetfunction(number)
+
+        threads = [Thread(target=call_target_function) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        verify(targetpackage, times=4).targetfunction(42)
+        assert_that(len(get_registry().call_entries), equal_to(400))
+
+    def test_should_isolate_registries_of_threads(self):
+
+        results = {}
+
+        def configure_and_verify(name):
+            token = fluentmock._activate_registry(FluentRegistry())
+            try:
+                mock_object = Mock()
+                when(mock_object).warn(name).then_return(name.upper())
+                results[name] = (mock_object.warn(name), len(get_registry().call_entries))
+                fluentmock.undo_patches()
+            finally:
+                fluentmock._deactivate_registry(token)
+
+        threads = [Thread(target=configure_and_verify, args=(name,)) for name in ('spam', 'eggs')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert_that(results, equal_to({'spam': ('SPAM', 1), 'eggs': ('EGGS', 1)}))
+        assert_that(get_registry().call_entries, equal_to([]))
+
+
+class UnitTestsLifecycleTests(TestCase):
+
+    def test_should_tear_down_test_which_overrides_set_up_without_calling_it(self):
+
+        class OverridingSetUpTests(UnitTests):
+
+            def setUp(self):
+                pass
+
+            def test_patching(self):
+                when(targetpackage).patch_test_1().then_return('patched 1')
+
+        result = TestResult()
+        OverridingSetUpTests('test_patching').run(result)
+
+        assert_that(result.errors, equal_to([]))
+        assert_that(targetpackage.patch_test_1(), equal_to('not patched 1'))
+
+    def test_should_undo_patches_when_set_up_raises_exception(self):
+
+        registry = get_registry()
+
+        class FailingSetUpTests(UnitTests):
+
+            def set_up(self):
+                when(targetpackage).patch_test_1().then_return('patched 1')
+                raise ValueError('spam')
+
+            def test_nothing(self):
+                pass
+
+        result = TestResult()
+        FailingSetUpTests('test_nothing').run(result)
+
+        assert_that(len(result.errors), equal_to(1))
+        assert_that(targetpackage.patch_test_1(), equal_to('not patched 1'))
+        assert_that(get_registry(), same_instance(registry))
+
+
+class PatchedBeforeTestsTests(UnitTests):
+
+    @classmethod
+    def setUpClass(cls):
+        when(targetpackage).patch_test_1().then_return('patched before the tests')
+
+    @classmethod
+    def tearDownClass(cls):
+        undo_patches()
+
+    def test_should_answer_with_stub_of_registry_active_before_the_test(self):
+
+        assert_that(targetpackage.patch_test_1(), equal_to('patched before the tests'))
+
+    def test_should_verify_call_of_target_patched_before_the_test(self):
+
+        targetpackage.patch_test_1()
+
+        verify(targetpackage).patch_test_1()
+
+    def test_should_use_registry_active_before_the_test_as_parent(self):
+
+        assert_that(get_registry().parent, same_instance(fluentmock._default_registry))
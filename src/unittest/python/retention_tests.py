@@ -0,0 +1,307 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import gc
+from weakref import ref
+
+from hamcrest import assert_that, contains_string, ends_with, equal_to
+
+from fluentmock import (ANY_INTEGER,
+                        ANY_STRING,
+                        ANY_VALUE,
+                        ANY_VALUES,
+                        NEVER,
+                        RETAIN_DIGESTS,
+                        RETAIN_WEAK_REFERENCES,
+                        UnitTests,
+                        set_argument_retention,
+                        verify,
+                        when)
+from fluentmock.exceptions import VerificationError
+from fluentmock.matchers import (all_elements_match,
+                                 an_iterable_containing,
+                                 any_element_matches,
+                                 any_of,
+                                 any_value_of_type,
+                                 has_length,
+                                 not_)
+from fluentmock.retention import ReplayableIterator
+
+import targetpackage
+
+
+class Payload(object):
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Payload) and self.value == other.value
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __repr__(self):
+        return 'Payload(%r)' % self.value
+
+
+class HashablePayload(Payload):
+
+    def __hash__(self):
+        return hash(self.value)
+
+
+class WeakReferenceRetentionTests(UnitTests):
+
+    def test_should_not_keep_argument_alive(self):
+
+        when(targetpackage, retention=RETAIN_WEAK_REFERENCES).targetfunction(ANY_VALUES).then_return(1)
+
+        payload = Payload('spam')
+        payload_reference = ref(payload)
+        targetpackage.targetfunction(payload)
+        del payload
+        gc.collect()
+
+        assert_that(payload_reference(), equal_to(None))
+
+    def test_should_verify_argument_while_it_is_alive(self):
+
+        when(targetpackage, retention=RETAIN_WEAK_REFERENCES).targetfunction(ANY_VALUES).then_return(1)
+
+        payload = Payload('spam')
+        targetpackage.targetfunction(payload, 'eggs')
+
+        verify(targetpackage).targetfunction(Payload('spam'), 'eggs')
+        verify(targetpackage).targetfunction(ANY_VALUE, 'eggs')
+        verify(targetpackage, NEVER).targetfunction(Payload('eggs'), 'eggs')
+
+    def test_should_raise_error_when_matching_garbage_collected_argument(self):
+
+        when(targetpackage, retention=RETAIN_WEAK_REFERENCES).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(Payload('spam'))
+        gc.collect()
+
+        exception_raised = False
+        try:
+            verify(targetpackage).targetfunction(any_of(Payload('spam')))
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), ends_with("""
+  Reason: The calls have been recorded retaining only weak references to the arguments, \
+which is not enough to verify this.
+"""))
+
+        assert_that(exception_raised)
+
+    def test_should_match_type_of_garbage_collected_argument(self):
+
+        when(targetpackage, retention=RETAIN_WEAK_REFERENCES).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(Payload('spam'), 'eggs')
+        gc.collect()
+
+        verify(targetpackage).targetfunction(ANY_VALUE, 'eggs')
+        verify(targetpackage).targetfunction(any_value_of_type(Payload), ANY_STRING)
+        verify(targetpackage, NEVER).targetfunction(ANY_INTEGER, 'eggs')
+        verify(targetpackage).targetfunction(not_(ANY_INTEGER), ANY_VALUE)
+
+    def test_should_raise_error_when_verifying_garbage_collected_argument_with_equal_value(self):
+
+        when(targetpackage, retention=RETAIN_WEAK_REFERENCES).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(Payload('spam'), 'eggs')
+        gc.collect()
+
+        exception_raised = False
+        try:
+            verify(targetpackage).targetfunction(Payload('spam'), 'eggs')
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), contains_string("Reason: The calls have been recorded retaining only weak "
+                                                    "references to the arguments"))
+
+        assert_that(exception_raised)
+
+    def test_should_raise_error_when_counting_garbage_collected_hashable_argument_with_equal_value(self):
+
+        when(targetpackage, retention=RETAIN_WEAK_REFERENCES).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(HashablePayload('spam'))
+        gc.collect()
+
+        exception_raised = False
+        try:
+            verify(targetpackage).targetfunction(HashablePayload('spam'))
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), contains_string("Reason: The calls have been recorded retaining only weak "
+                                                    "references to the arguments"))
+
+        assert_that(exception_raised)
+
+    def test_should_verify_other_arguments_than_garbage_collected_arguments(self):
+
+        when(targetpackage, retention=RETAIN_WEAK_REFERENCES).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(HashablePayload('spam'), 'eggs')
+        gc.collect()
+
+        verify(targetpackage, NEVER).targetfunction(HashablePayload('spam'), 'bacon')
+        verify(targetpackage, NEVER).targetfunction(Payload('spam'), 'bacon')
+
+    def test_should_answer_using_the_actual_argument(self):
+
+        when(targetpackage, retention=RETAIN_WEAK_REFERENCES).targetfunction(Payload('spam')).then_return(1)
+
+        assert_that(targetpackage.targetfunction(Payload('spam')), equal_to(1))
+
+
+class DigestRetentionTests(UnitTests):
+
+    def test_should_not_keep_argument_alive(self):
+
+        set_argument_retention(RETAIN_DIGESTS)
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(1)
+
+        payload = Payload('spam')
+        payload_reference = ref(payload)
+        targetpackage.targetfunction(payload)
+        del payload
+        gc.collect()
+
+        assert_that(payload_reference(), equal_to(None))
+
+    def test_should_verify_large_buffer_by_its_digest(self):
+
+        when(targetpackage, retention=RETAIN_DIGESTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(bytearray(b'x' * 100000), 'small')
+        targetpackage.targetfunction(b'y' * 100000)
+
+        verify(targetpackage, times=1).targetfunction(bytearray(b'x' * 100000), 'small')
+        verify(targetpackage, times=1).targetfunction(b'y' * 100000)
+        verify(targetpackage, NEVER).targetfunction(b'x' * 100000)
+
+    def test_should_verify_object_by_its_digest(self):
+
+        when(targetpackage, retention=RETAIN_DIGESTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(payload=Payload('spam'))
+
+        verify(targetpackage).targetfunction(payload=Payload('spam'))
+        verify(targetpackage, NEVER).targetfunction(payload=Payload('eggs'))
+
+    def test_should_verify_equal_dicts_and_sets_in_any_order_by_their_digest(self):
+
+        when(targetpackage, retention=RETAIN_DIGESTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction({'a': 1, 'b': 2}, [set(['spam', 'eggs']), {'c': {'d': 3, 'e': 4}}])
+
+        verify(targetpackage).targetfunction({'b': 2, 'a': 1}, [set(['eggs', 'spam']), {'c': {'e': 4, 'd': 3}}])
+        verify(targetpackage, NEVER).targetfunction({'a': 1, 'b': 3}, [set(['eggs', 'spam']), {'c': {}}])
+
+    def test_should_show_summary_of_argument(self):
+
+        when(targetpackage, retention=RETAIN_DIGESTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(Payload('spam'))
+
+        exception_raised = False
+        try:
+            verify(targetpackage, NEVER).targetfunction(ANY_VALUES)
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), contains_string("call targetpackage.targetfunction(<Payload sha1:"))
+            assert_that(str(error), contains_string("Payload('spam')>)"))
+
+        assert_that(exception_raised)
+
+    def test_should_raise_error_when_matching_digest_with_matcher(self):
+
+        when(targetpackage, retention=RETAIN_DIGESTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(Payload('spam'))
+
+        exception_raised = False
+        try:
+            verify(targetpackage).targetfunction(any_of(Payload('spam')))
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(str(error), contains_string('Reason: The calls have been recorded retaining only digests'))
+
+        assert_that(exception_raised)
+
+    def test_should_match_digest_with_matchers_of_any_value_and_type(self):
+
+        when(targetpackage, retention=RETAIN_DIGESTS).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(Payload('spam'), b'x' * 100000)
+
+        verify(targetpackage).targetfunction(ANY_VALUE, ANY_VALUE)
+        verify(targetpackage).targetfunction(any_value_of_type(Payload), any_value_of_type(bytes))
+        verify(targetpackage, NEVER).targetfunction(ANY_STRING, ANY_VALUE)
+
+
+class ReplayableIteratorTests(UnitTests):
+
+    def test_should_replay_the_items_of_a_generator_for_each_iteration(self):
+
+        replayable_iterator = ReplayableIterator(number for number in range(3))
+
+        assert_that(list(replayable_iterator), equal_to([0, 1, 2]))
+        assert_that(list(replayable_iterator), equal_to([0, 1, 2]))
+
+    def test_should_consume_the_generator_lazily(self):
+
+        generator = (number for number in range(10))
+        replayable_iterator = ReplayableIterator(generator)
+
+        assert_that(next(iter(replayable_iterator)), equal_to(0))
+        assert_that(next(generator), equal_to(1))
+
+    def test_should_be_equal_to_its_generator(self):
+
+        generator = (number for number in range(3))
+
+        assert_that(ReplayableIterator(generator) == generator, equal_to(True))
+
+    def test_should_match_and_verify_generator_argument(self):
+
+        when(targetpackage).targetfunction(has_length(3)).then_return('three')
+
+        assert_that(targetpackage.targetfunction(number for number in range(3)), equal_to('three'))
+
+        verify(targetpackage).targetfunction(an_iterable_containing(2))
+        verify(targetpackage).targetfunction(all_elements_match(ANY_INTEGER))
+
+    def test_should_verify_the_generator_passed_to_the_patched_function(self):
+
+        generator = (number for number in range(3))
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(None)
+
+        targetpackage.targetfunction(generator)
+
+        verify(targetpackage).targetfunction(generator)
+
+    def test_should_take_only_the_items_needed_by_the_matcher_from_the_generator(self):
+
+        generator = (number for number in range(1, 6))
+        when(targetpackage).targetfunction(any_element_matches(any_of(3))).then_return('three')
+
+        assert_that(targetpackage.targetfunction(generator), equal_to('three'))
+
+        assert_that(list(generator), equal_to([4, 5]))
@@ -0,0 +1,275 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import asyncio
+
+from hamcrest import assert_that, contains_string, equal_to, same_instance
+from mock import Mock
+
+import fluentmock
+from fluentmock import (ANY_VALUES,
+                        FluentMock,
+                        NEVER,
+                        RECORD_COUNTS,
+                        UnitTests,
+                        expect,
+                        get_registry,
+                        scope,
+                        scoped,
+                        set_recording_policy,
+                        verify,
+                        verify_in_order,
+                        when)
+from fluentmock.exceptions import AggregatedVerificationError, SignatureMismatchError
+
+import targetpackage
+import targetpackage.asynchronous
+import targetpackage.signatures
+from targetpackage.signatures import Calculator
+
+
+class ScopeTests(UnitTests):
+
+    def test_should_undo_patches_of_scope_when_scope_exits(self):
+
+        with scope():
+            when(targetpackage).patch_test_1().then_return('patched 1')
+
+            assert_that(targetpackage.patch_test_1(), equal_to('patched 1'))
+
+        assert_that(targetpackage.patch_test_1(), equal_to('not patched 1'))
+
+    def test_should_forget_resolved_modules_when_scope_exits(self):
+
+        with scope():
+            when('targetpackage').patch_test_1().then_return('patched 1')
+
+        assert_that(fluentmock._resolved_modules, equal_to({}))
+
+    def test_should_keep_patches_of_outer_scope(self):
+
+        when(targetpackage).patch_test_1().then_return('outer 1')
+
+        with scope():
+            when(targetpackage).patch_test_2().then_return('inner 2')
+
+            assert_that(targetpackage.patch_test_1(), equal_to('outer 1'))
+            assert_that(targetpackage.patch_test_2(), equal_to('inner 2'))
+
+        assert_that(targetpackage.patch_test_1(), equal_to('outer 1'))
+        assert_that(targetpackage.patch_test_2(), equal_to('not patched 2'))
+
+    def test_should_restore_answer_of_outer_scope_when_inner_scope_exits(self):
+
+        when(targetpackage).patch_test_1().then_return('outer')
+
+        with scope():
+            when(targetpackage).patch_test_1().then_return('inner')
+
+            assert_that(targetpackage.patch_test_1(), equal_to('inner'))
+
+        assert_that(targetpackage.patch_test_1(), equal_to('outer'))
+
+    def test_should_answer_with_stubs_of_outer_scope_when_no_stub_of_inner_scope_matches(self):
+
+        when(targetpackage).patch_test_1(1).then_return('outer')
+
+        with scope():
+            when(targetpackage).patch_test_1(2).then_return('inner')
+
+            assert_that(targetpackage.patch_test_1(1), equal_to('outer'))
+            assert_that(targetpackage.patch_test_1(2), equal_to('inner'))
+            assert_that(targetpackage.patch_test_1(3), equal_to(None))
+
+            with scope():
+                when(targetpackage).patch_test_1(3).then_return('innermost')
+
+                assert_that(targetpackage.patch_test_1(1), equal_to('outer'))
+                assert_that(targetpackage.patch_test_1(2), equal_to('inner'))
+                assert_that(targetpackage.patch_test_1(3), equal_to('innermost'))
+
+    def test_should_unwind_nested_scopes_in_reverse_order(self):
+
+        with scope():
+            when(targetpackage).patch_test_1().then_return('first')
+
+            with scope():
+                when(targetpackage).patch_test_1().then_return('second')
+
+                assert_that(targetpackage.patch_test_1(), equal_to('second'))
+
+            assert_that(targetpackage.patch_test_1(), equal_to('first'))
+
+        assert_that(targetpackage.patch_test_1(), equal_to('not patched 1'))
+
+    def test_should_undo_patches_of_scope_when_an_exception_is_raised(self):
+
+        try:
+            with scope():
+                when(targetpackage).patch_test_1().then_return('patched 1')
+                raise ValueError('spam')
+        except ValueError:
+            pass
+
+        assert_that(targetpackage.patch_test_1(), equal_to('not patched 1'))
+
+    def test_should_activate_registry_of_scope(self):
+
+        outer_registry = get_registry()
+
+        with scope() as registry:
+            assert_that(get_registry(), same_instance(registry))
+            assert_that(registry.parent, same_instance(outer_registry))
+
+        assert_that(get_registry(), same_instance(outer_registry))
+
+    def test_should_verify_calls_of_target_patched_in_outer_scope(self):
+
+        when(targetpackage).patch_test_1(ANY_VALUES).then_return('outer')
+
+        with scope():
+            when(targetpackage).patch_test_2(ANY_VALUES).then_return('inner')
+
+            targetpackage.patch_test_1('spam')
+            targetpackage.patch_test_2('eggs')
+
+            verify(targetpackage).patch_test_1('spam')
+            verify(targetpackage).patch_test_2('eggs')
+
+    def test_should_not_verify_calls_of_inner_scope_in_outer_scope(self):
+
+        when(targetpackage).patch_test_1(ANY_VALUES).then_return('outer')
+
+        with scope():
+            when(targetpackage).patch_test_1(ANY_VALUES).then_return('inner')
+            targetpackage.patch_test_1('spam')
+
+        verify(targetpackage, NEVER).patch_test_1('spam')
+
+    def test_should_raise_error_when_verifying_order_of_calls_recorded_in_outer_scope(self):
+
+        when(targetpackage).patch_test_1(ANY_VALUES).then_return('outer')
+
+        with scope():
+            when(targetpackage).patch_test_2(ANY_VALUES).then_return('inner')
+
+            targetpackage.patch_test_1('spam')
+            targetpackage.patch_test_2('eggs')
+
+            exception_raised = False
+            try:
+                verify_in_order(expect(targetpackage).patch_test_1('spam'),
+                                expect(targetpackage).patch_test_2('eggs'))
+            except AggregatedVerificationError as error:
+                exception_raised = True
+                assert_that(str(error), contains_string('The calls have been recorded in an outer scope'))
+
+            assert_that(exception_raised)
+
+    def test_should_use_recording_policy_of_outer_scope(self):
+
+        set_recording_policy(RECORD_COUNTS)
+
+        with scope() as registry:
+            assert_that(registry.recording_policy, same_instance(RECORD_COUNTS))
+
+    def test_should_restore_attribute_of_mock_when_scope_exits(self):
+
+        mock = Mock()
+        when(mock).some_method().then_return('outer')
+
+        with scope():
+            when(mock).some_method().then_return('inner')
+
+            assert_that(mock.some_method(), equal_to('inner'))
+
+        assert_that(mock.some_method(), equal_to('outer'))
+
+    def test_should_keep_coroutine_function_patched_in_inner_scope_awaitable(self):
+
+        when(targetpackage.asynchronous).fetch(1).then_return('outer')
+
+        with scope():
+            when(targetpackage.asynchronous).fetch(1).then_return('inner')
+
+            loop = asyncio.new_event_loop()
+            try:
+                assert_that(loop.run_until_complete(targetpackage.asynchronous.fetch(1)), equal_to('inner'))
+            finally:
+                loop.close()
+
+    def test_should_check_signature_when_target_patched_in_outer_scope_is_patched_with_autospec(self):
+
+        when(targetpackage.signatures).configure(ANY_VALUES).then_return('outer')
+
+        with scope():
+            when(targetpackage.signatures, autospec=True).configure(ANY_VALUES).then_return('inner')
+
+            self.assertRaises(SignatureMismatchError, targetpackage.signatures.configure, 1, 2, 3, 4, 5)
+
+    def test_should_normalize_arguments_when_target_patched_in_outer_scope_is_patched_with_normalize(self):
+
+        when(targetpackage.signatures).configure(ANY_VALUES).then_return('outer')
+
+        with scope():
+            when(targetpackage.signatures, normalize=True).configure(1, verbose=5).then_return('inner')
+
+            assert_that(targetpackage.signatures.configure(1, 5), equal_to('inner'))
+
+    def test_should_check_signature_of_method_patched_in_outer_scope(self):
+
+        when(Calculator).add(ANY_VALUES).then_return('outer')
+
+        with scope():
+            when(Calculator, autospec=True).add(1, second=2).then_return('inner')
+
+            assert_that(Calculator().add(1, 2), equal_to('inner'))
+            self.assertRaises(SignatureMismatchError, Calculator().add, 1, 2, 3)
+
+
+class ScopedTests(UnitTests):
+
+    def test_should_undo_patches_when_decorated_function_returns(self):
+
+        @scoped
+        def patch_and_call():
+            when(targetpackage).patch_test_1().then_return('patched 1')
+            return targetpackage.patch_test_1()
+
+        assert_that(patch_and_call(), equal_to('patched 1'))
+        assert_that(targetpackage.patch_test_1(), equal_to('not patched 1'))
+
+    def test_should_keep_name_of_decorated_function(self):
+
+        @scoped
+        def patch_and_call():
+            pass
+
+        assert_that(patch_and_call.__name__, equal_to('patch_and_call'))
+
+    def test_should_undo_patches_when_decorated_coroutine_function_returns(self):
+
+        @scoped
+        async def patch_and_await():
+            when(targetpackage.asynchronous).fetch(1).then_return('patched')
+            return await targetpackage.asynchronous.fetch(1)
+
+        loop = asyncio.new_event_loop()
+        try:
+            assert_that(loop.run_until_complete(patch_and_await()), equal_to('patched'))
+        finally:
+            loop.close()
+
+        assert_that(isinstance(targetpackage.asynchronous.fetch, FluentMock), equal_to(False))
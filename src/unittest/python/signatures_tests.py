@@ -0,0 +1,211 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from hamcrest import assert_that, equal_to, instance_of, same_instance
+from mock import patch
+
+from fluentmock import ANY_INTEGER, ANY_VALUE, ANY_VALUES, NEVER, RECORD_COUNTS, UnitTests, verify, when
+from fluentmock.exceptions import AutospecNotSupportedError, SignatureMismatchError
+from fluentmock.signatures import TargetSignature, callable_of_attribute, signature_of_callable
+
+from targetpackage.signatures import Calculator
+import targetpackage.signatures
+
+
+class AutospecTests(UnitTests):
+
+    def test_should_raise_error_when_answer_does_not_match_signature(self):
+
+        configurator = when(targetpackage.signatures, autospec=True).configure
+
+        self.assertRaises(SignatureMismatchError, configurator, 'spam', 'eggs', 'bacon')
+
+    def test_should_raise_error_when_signatures_are_not_supported(self):
+
+        with patch('fluentmock.signatures._signature_of', None):
+            self.assertRaises(AutospecNotSupportedError,
+                              lambda: when(targetpackage.signatures, autospec=True).configure)
+
+    def test_should_raise_type_error_when_call_does_not_match_signature(self):
+
+        when(targetpackage.signatures, autospec=True).configure(ANY_VALUES).then_return('configured')
+
+        exception_raised = False
+        try:
+            targetpackage.signatures.configure('spam', colour='green')
+        except TypeError as error:
+            exception_raised = True
+            assert_that(error, instance_of(SignatureMismatchError))
+            assert_that(str(error), equal_to(
+                "The arguments ('spam', colour='green') do not match the signature "
+                "targetpackage.signatures.configure(name, verbose=False): "
+                "got an unexpected keyword argument 'colour'"))
+
+        assert_that(exception_raised)
+
+    def test_should_answer_calls_in_positional_and_keyword_form(self):
+
+        when(targetpackage.signatures, autospec=True).compute(1, second=3).then_return('computed')
+
+        assert_that(targetpackage.signatures.compute(1, 3), equal_to('computed'))
+        assert_that(targetpackage.signatures.compute(first=1, second=3), equal_to('computed'))
+        assert_that(targetpackage.signatures.compute(1, 4), equal_to(None))
+
+    def test_should_verify_calls_in_positional_and_keyword_form(self):
+
+        when(targetpackage.signatures, autospec=True).compute(ANY_VALUES).then_return('computed')
+
+        targetpackage.signatures.compute(1, 3)
+        targetpackage.signatures.compute(first=1, second=3)
+        targetpackage.signatures.compute(1, 3, 5, verbose=True)
+
+        verify(targetpackage.signatures, times=2).compute(second=3, first=1)
+        verify(targetpackage.signatures, times=1).compute(1, 3, 5, verbose=True)
+        verify(targetpackage.signatures, NEVER).compute(1)
+
+    def test_should_bind_matchers_to_the_signature(self):
+
+        when(targetpackage.signatures, autospec=True).compute(ANY_VALUE, second=ANY_INTEGER).then_return('computed')
+
+        assert_that(targetpackage.signatures.compute('spam', 3), equal_to('computed'))
+        assert_that(targetpackage.signatures.compute('spam', 'eggs'), equal_to(None))
+
+    def test_should_raise_error_when_verifying_call_which_does_not_match_signature(self):
+
+        when(targetpackage.signatures, autospec=True).configure(ANY_VALUES).then_return('configured')
+
+        exception_raised = False
+        try:
+            verify(targetpackage.signatures).configure()
+        except SignatureMismatchError:
+            exception_raised = True
+
+        assert_that(exception_raised)
+
+    def test_should_not_check_signature_without_autospec(self):
+
+        when(targetpackage.signatures).configure('spam', 'eggs', 'bacon').then_return('configured')
+
+        assert_that(targetpackage.signatures.configure('spam', 'eggs', 'bacon'), equal_to('configured'))
+
+    def test_should_check_method_patched_on_class_without_self(self):
+
+        when(Calculator, autospec=True).add(1, second=2).then_return(3)
+
+        assert_that(Calculator().add(first=1, second=2), equal_to(3))
+        self.assertRaises(SignatureMismatchError, Calculator().add, 1, 2, 3)
+
+    def test_should_check_static_method_patched_on_class(self):
+
+        when(Calculator, autospec=True).negate(value=1).then_return(-1)
+
+        assert_that(Calculator.negate(1), equal_to(-1))
+
+    def test_should_check_class_method_patched_on_class(self):
+
+        when(Calculator, autospec=True).create(name='spam').then_return('created')
+
+        assert_that(Calculator.create('spam'), equal_to('created'))
+
+    def test_should_check_method_patched_on_instance(self):
+
+        calculator = Calculator()
+
+        when(calculator, autospec=True).add(1, 2).then_return(3)
+
+        assert_that(calculator.add(second=2, first=1), equal_to(3))
+
+
+class NormalizeTests(UnitTests):
+
+    def test_should_answer_calls_in_positional_and_keyword_form(self):
+
+        when(targetpackage.signatures, normalize=True).configure('spam', verbose=True).then_return('configured')
+
+        assert_that(targetpackage.signatures.configure('spam', True), equal_to('configured'))
+        assert_that(targetpackage.signatures.configure(name='spam', verbose=True), equal_to('configured'))
+
+    def test_should_count_calls_in_positional_and_keyword_form_with_one_signature(self):
+
+        when(targetpackage.signatures, normalize=True, recording=RECORD_COUNTS).configure(ANY_VALUES).then_return(1)
+
+        targetpackage.signatures.configure('spam', True)
+        targetpackage.signatures.configure(name='spam', verbose=True)
+        targetpackage.signatures.configure(verbose=True, name='spam')
+
+        verify(targetpackage.signatures, times=3).configure('spam', verbose=True)
+
+    def test_should_keep_arguments_which_do_not_match_signature(self):
+
+        when(targetpackage.signatures, normalize=True).configure('spam', 'eggs', 'bacon').then_return('configured')
+
+        assert_that(targetpackage.signatures.configure('spam', 'eggs', 'bacon'), equal_to('configured'))
+
+        verify(targetpackage.signatures).configure('spam', 'eggs', 'bacon')
+
+    def test_should_treat_positional_and_keyword_forms_as_different_calls_by_default(self):
+
+        when(targetpackage.signatures).configure('spam', verbose=True).then_return('configured')
+
+        assert_that(targetpackage.signatures.configure('spam', True), equal_to(None))
+
+
+class TargetSignatureTests(UnitTests):
+
+    def test_should_return_arguments_which_are_already_canonical(self):
+
+        target_signature = signature_of_callable(targetpackage.signatures.compute)
+        arguments = (1, 2, 3)
+        keyword_arguments = {}
+
+        actual_arguments, actual_keyword_arguments = target_signature.canonical_arguments(arguments,
+                                                                                          keyword_arguments)
+
+        assert_that(actual_arguments, same_instance(arguments))
+        assert_that(actual_keyword_arguments, same_instance(keyword_arguments))
+
+    def test_should_bind_keyword_arguments_to_positional_parameters(self):
+
+        target_signature = signature_of_callable(targetpackage.signatures.compute)
+
+        actual = target_signature.canonical_arguments((), {'second': 3, 'first': 1, 'verbose': True})
+
+        assert_that(actual, equal_to(((1, 3), {'verbose': True})))
+
+    def test_should_raise_type_error_when_required_argument_is_missing(self):
+
+        target_signature = signature_of_callable(targetpackage.signatures.compute)
+
+        self.assertRaises(TypeError, target_signature.canonical_arguments, (), {'second': 3})
+
+    def test_should_cache_signature_of_callable(self):
+
+        actual = signature_of_callable(targetpackage.signatures.compute)
+
+        assert_that(actual, instance_of(TargetSignature))
+        assert_that(actual, same_instance(signature_of_callable(targetpackage.signatures.compute)))
+
+    def test_should_return_none_when_signature_can_not_be_determined(self):
+
+        assert_that(signature_of_callable(targetpackage.signatures.sys.stdout), equal_to(None))
+
+    def test_should_drop_first_parameter_of_functions_called_through_instances_of_class(self):
+
+        assert_that(callable_of_attribute(Calculator, 'add', Calculator.add), equal_to((Calculator.add, True)))
+        assert_that(callable_of_attribute(Calculator, 'negate', Calculator.negate),
+                    equal_to((Calculator.negate, False)))
+        assert_that(callable_of_attribute(Calculator, 'create', Calculator.create)[1], equal_to(True))
+        assert_that(callable_of_attribute(targetpackage.signatures, 'compute', targetpackage.signatures.compute),
+                    equal_to((targetpackage.signatures.compute, False)))
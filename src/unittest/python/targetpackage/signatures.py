@@ -0,0 +1,38 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+import sys
+
+
+def compute(first, second=2, *more, **options):
+    sys.stdout.write("WARNING! Actual function has been called.\n")
+
+
+def configure(name, verbose=False):
+    sys.stdout.write("WARNING! Actual function has been called.\n")
+
+
+class Calculator(object):
+
+    def add(self, first, second):
+        sys.stdout.write("WARNING! Actual method has been called.\n")
+
+    @staticmethod
+    def negate(value):
+        sys.stdout.write("WARNING! Actual method has been called.\n")
+
+    @classmethod
+    def create(cls, name):
+        sys.stdout.write("WARNING! Actual method has been called.\n")
@@ -16,6 +16,7 @@
 from unittest import TestCase
 
 from hamcrest import assert_that, equal_to
+import fluentmock
 from fluentmock import when, undo_patches, get_patches
 
 import targetpackage
@@ -49,3 +50,21 @@ class UndoPatchesTests(TestCase):
         undo_patches()
 
         assert_that(get_patches(), equal_to([]))
+
+    def test_should_forget_resolved_modules(self):
+
+        when('targetpackage').patch_test_1().then_return('patched call! 1')
+
+        undo_patches()
+
+        assert_that(fluentmock._resolved_modules, equal_to({}))
+
+    def test_should_register_one_patch_per_patched_attribute(self):
+
+        for argument in range(10):
+            when(targetpackage).patch_test_1(argument).then_return('patched call! 1')
+        when(targetpackage).patch_test_2().then_return('patched call! 2')
+
+        assert_that(len(get_patches()), equal_to(2))
+
+        undo_patches()
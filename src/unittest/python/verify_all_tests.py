@@ -0,0 +1,136 @@
+#   fluentmock
+#   Copyright 2013-2015 Michael Gruber
+#
+#   Licensed under the Apache License, Version 2.0 (the "License");
+#   you may not use this file except in compliance with the License.
+#   You may obtain a copy of the License at
+#
+#       http://www.apache.org/licenses/LICENSE-2.0
+#
+#   Unless required by applicable law or agreed to in writing, software
+#   distributed under the License is distributed on an "AS IS" BASIS,
+#   WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+#   See the License for the specific language governing permissions and
+#   limitations under the License.
+
+from hamcrest import assert_that, equal_to
+from mock import Mock
+
+from fluentmock import ANY_VALUE, ANY_VALUES, NEVER, UnitTests, expect, verify_all, verify_in_order, when
+from fluentmock.exceptions import AggregatedVerificationError, VerificationError
+
+import targetpackage
+
+
+class VerifyAllTests(UnitTests):
+
+    def test_should_verify_all_expected_calls(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(1)
+        when(targetpackage).patch_test_1(ANY_VALUES).then_return(2)
+
+        targetpackage.targetfunction(1)
+        targetpackage.patch_test_1('a')
+        targetpackage.targetfunction(1)
+
+        verify_all(expect(targetpackage, times=2).targetfunction(1),
+                   expect(targetpackage).patch_test_1(ANY_VALUE),
+                   expect(targetpackage, NEVER).patch_test_1('b'))
+
+    def test_should_report_all_failed_expectations_in_one_error(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(1)
+        when(targetpackage).patch_test_1(ANY_VALUES).then_return(2)
+
+        targetpackage.targetfunction(1)
+        targetpackage.patch_test_1('a')
+
+        exception_raised = False
+        try:
+            verify_all(expect(targetpackage).targetfunction(2),
+                       expect(targetpackage).targetfunction(1),
+                       expect(targetpackage, NEVER).patch_test_1('a'))
+        except AggregatedVerificationError as error:
+            exception_raised = True
+            assert_that(len(error.errors), equal_to(2))
+            assert_that(str(error), equal_to("""
+2 of the expected calls could not be verified:
+
+Expected: call targetpackage.targetfunction(2) << at least once >>
+ but was: call targetpackage.targetfunction(1)
+
+Expected: call targetpackage.patch_test_1('a') << should never be called >>
+ but was: call targetpackage.patch_test_1('a')
+"""))
+
+        assert_that(exception_raised)
+
+    def test_should_be_a_verification_error(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(1)
+
+        self.assertRaises(VerificationError, verify_all, expect(targetpackage).targetfunction(1))
+
+    def test_should_verify_expected_calls_of_plain_mock(self):
+
+        mock_object = Mock()
+
+        mock_object.warn('hello')
+
+        verify_all(expect(mock_object).warn('hello'),
+                   expect(mock_object, NEVER).warn('world'))
+
+    def test_should_raise_type_error_when_given_unknown_keyword_argument(self):
+
+        self.assertRaises(TypeError, verify_all, in_oder=True)
+
+
+class VerifyInOrderTests(UnitTests):
+
+    def test_should_verify_calls_in_given_order(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(1)
+        when(targetpackage).patch_test_1(ANY_VALUES).then_return(2)
+
+        targetpackage.targetfunction(1)
+        targetpackage.patch_test_1(2)
+        targetpackage.targetfunction(3)
+
+        verify_in_order(expect(targetpackage).targetfunction(1),
+                        expect(targetpackage).patch_test_1(2),
+                        expect(targetpackage).targetfunction(3))
+
+    def test_should_raise_error_when_calls_have_been_made_in_other_order(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(1)
+        when(targetpackage).patch_test_1(ANY_VALUES).then_return(2)
+
+        targetpackage.patch_test_1(2)
+        targetpackage.targetfunction(1)
+
+        exception_raised = False
+        try:
+            verify_all(expect(targetpackage).targetfunction(1),
+                       expect(targetpackage).patch_test_1(2),
+                       in_order=True)
+        except AggregatedVerificationError as error:
+            exception_raised = True
+            assert_that(str(error), equal_to("""
+1 of the expected calls could not be verified:
+
+Expected: call targetpackage.patch_test_1(2) << at least once >>
+  Reason: Not called in the given order.
+"""))
+
+        assert_that(exception_raised)
+
+    def test_should_ignore_never_expectations_when_verifying_order(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(1)
+
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction(2)
+
+        verify_in_order(expect(targetpackage).targetfunction(1),
+                        expect(targetpackage, NEVER).targetfunction(3),
+                        expect(targetpackage).targetfunction(2))
@@ -13,13 +13,19 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
+import gc
+from weakref import ref
+
 from mock import Mock
-from hamcrest import assert_that, equal_to, ends_with
+from hamcrest import assert_that, equal_to, ends_with, same_instance
 from fluentmock import (ANY_BOOLEAN,
+                        ANY_INTEGER,
                         ANY_LIST,
                         ANY_VALUE,
                         ANY_VALUES,
                         NEVER,
+                        FluentCallEntry,
+                        FluentTarget,
                         UnitTests,
                         when,
                         verify)
@@ -400,26 +406,31 @@ Expected: call mock.Mock.some_method(1, 2, 3, hello='world') << should never be
 
         assert_that(exception_raised)
 
-    def test_should_raise_exception_when_trying_to_use_matcher_in_native_verification(self):
+    def test_should_verify_matcher_in_native_verification(self):
 
         test_object = Mock(targetpackage.TheClass())
 
         test_object.some_method(1, 2, 3, hello='world')
 
-        exception_raised = False
-        try:
-            verify(test_object).some_method(ANY_VALUE, 2, 3, hello='world')
-        except VerificationError as error:
-            exception_raised = True
-            assert_that(str(error), ends_with("""
-          Please configure your mock using fluentmock.when in order
-          to be able to use matchers!
+        verify(test_object).some_method(ANY_VALUE, 2, 3, hello='world')
 
-"""))
+    def test_should_verify_matcher_as_second_argument_in_native_verification(self):
 
-        assert_that(exception_raised)
+        test_object = Mock(targetpackage.TheClass())
+
+        test_object.some_method(1, 2, 3, hello='world')
+
+        verify(test_object).some_method(1, ANY_VALUE, 3, hello='world')
+
+    def test_should_verify_matcher_as_keyword_argument_in_native_verification(self):
+
+        test_object = Mock(targetpackage.TheClass())
+
+        test_object.some_method(1, 2, 3, hello='world')
+
+        verify(test_object).some_method(1, 2, 3, hello=ANY_VALUE)
 
-    def test_should_raise_exception_when_trying_to_use_matcher_as_second_argument_in_native_verification(self):
+    def test_should_raise_exception_when_matcher_as_second_keyword_argument_does_not_match_native_call(self):
 
         test_object = Mock(targetpackage.TheClass())
 
@@ -427,54 +438,63 @@ Expected: call mock.Mock.some_method(1, 2, 3, hello='world') << should never be
 
         exception_raised = False
         try:
-            verify(test_object).some_method(1, ANY_VALUE, 3, hello='world')
+            verify(test_object).some_method(1, 2, 3, hello='world', world=ANY_VALUE)
         except VerificationError as error:
             exception_raised = True
-            assert_that(str(error), ends_with("""
-          Please configure your mock using fluentmock.when in order
-          to be able to use matchers!
-
+            assert_that(str(error), equal_to("""
+Expected: call mock.Mock.some_method(1, 2, 3, hello='world', world=<< ANY_VALUE >>) << at least once >>
+ but was: call mock.Mock.some_method(1, 2, 3, hello='world')
 """))
 
         assert_that(exception_raised)
 
-    def test_should_raise_exception_when_trying_to_use_matcher_as_keyword_argument_in_native_verification(self):
+    def test_should_count_calls_made_after_previous_native_verification(self):
 
         test_object = Mock(targetpackage.TheClass())
 
-        test_object.some_method(1, 2, 3, hello='world')
+        test_object.some_method(1)
+        verify(test_object, times=1).some_method(ANY_INTEGER)
 
-        exception_raised = False
-        try:
-            verify(test_object).some_method(1, 2, 3, hello=ANY_VALUE)
-        except VerificationError as error:
-            exception_raised = True
-            assert_that(str(error), ends_with("""
-          Please configure your mock using fluentmock.when in order
-          to be able to use matchers!
+        test_object.some_method(2)
+        test_object.some_method('spam')
 
-"""))
+        verify(test_object, times=2).some_method(ANY_INTEGER)
+        verify(test_object, times=1).some_method(2)
+        verify(test_object, times=3).some_method(ANY_VALUES)
 
-        assert_that(exception_raised)
+    def test_should_count_calls_made_after_resetting_the_mock(self):
+
+        test_object = Mock(targetpackage.TheClass())
 
-    def test_should_raise_exception_when_trying_to_use_matcher_as_second_keyword_argument_in_native_verification(self):
+        test_object.some_method(1)
+        test_object.some_method(1)
+        verify(test_object, times=2).some_method(1)
+
+        test_object.reset_mock()
+        test_object.some_method(1)
+
+        verify(test_object, times=1).some_method(1)
+
+    def test_should_verify_unhashable_arguments_in_native_verification(self):
 
         test_object = Mock(targetpackage.TheClass())
 
-        test_object.some_method(1, 2, 3, hello='world')
+        test_object.some_method([1, 2], spam={'eggs': 1})
 
-        exception_raised = False
-        try:
-            verify(test_object).some_method(1, 2, 3, hello='world', world=ANY_VALUE)
-        except VerificationError as error:
-            exception_raised = True
-            assert_that(str(error), ends_with("""
-          Please configure your mock using fluentmock.when in order
-          to be able to use matchers!
+        verify(test_object).some_method([1, 2], spam={'eggs': 1})
+        verify(test_object, NEVER).some_method([1, 2], spam={'eggs': 2})
 
-"""))
+    def test_should_not_keep_verified_mock_alive(self):
 
-        assert_that(exception_raised)
+        test_object = Mock(targetpackage.TheClass())
+        test_object.some_method(1)
+        verify(test_object).some_method(1)
+
+        reference_to_test_object = ref(test_object)
+        del test_object
+        gc.collect()
+
+        assert_that(reference_to_test_object(), equal_to(None))
 
     def test_should_list_actual_calls(self):
         mock_object = Mock()
@@ -849,3 +869,146 @@ Expected: call targetpackage.call(['pip'], stderr=<< Any value of type "bool" >>
 """))
 
         assert_that(exception_raised)
+
+
+class IndexedVerificationTests(UnitTests):
+
+    def test_should_only_count_calls_of_the_verified_function(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(123)
+        when(targetpackage).patch_test_1(ANY_VALUES).then_return(123)
+
+        targetpackage.targetfunction(1)
+        targetpackage.patch_test_1(1)
+        targetpackage.patch_test_1(1)
+
+        verify(targetpackage, times=1).targetfunction(1)
+        verify(targetpackage, times=2).patch_test_1(1)
+
+    def test_should_count_calls_with_unhashable_arguments(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(123)
+
+        targetpackage.targetfunction([1, 2])
+        targetpackage.targetfunction([1, 2])
+        targetpackage.targetfunction((1, 2))
+
+        verify(targetpackage, times=2).targetfunction([1, 2])
+        verify(targetpackage, times=1).targetfunction((1, 2))
+        verify(targetpackage, times=3).targetfunction(ANY_VALUE)
+
+    def test_should_count_calls_with_keyword_arguments_given_in_any_order(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(123)
+
+        targetpackage.targetfunction(spam='eggs', hello='world')
+        targetpackage.targetfunction(hello='world', spam='eggs')
+
+        verify(targetpackage, times=2).targetfunction(hello='world', spam='eggs')
+        verify(targetpackage, times=2).targetfunction(hello=ANY_VALUE, spam='eggs')
+
+
+class RecordedCallEntryTests(UnitTests):
+
+    def test_should_reuse_the_resolved_target(self):
+
+        fluent_target = FluentTarget(targetpackage, 'targetfunction')
+
+        call_entry = FluentCallEntry.of_resolved_target(fluent_target, (1, 2), {'hello': 'world'})
+
+        assert_that(call_entry.target, same_instance(fluent_target))
+
+    def test_should_represent_call_entry_of_resolved_target(self):
+
+        fluent_target = FluentTarget(targetpackage, 'targetfunction')
+
+        call_entry = FluentCallEntry.of_resolved_target(fluent_target, (1, 2), {'hello': 'world'})
+
+        assert_that(repr(call_entry), equal_to("call targetpackage.targetfunction(1, 2, hello='world')"))
+
+    def test_should_match_arguments_of_call_entry_with_same_signature(self):
+
+        call_entry = FluentCallEntry(targetpackage, 'targetfunction', (1, 2), {'hello': 'world', 'spam': 'eggs'})
+        expected_call_entry = FluentCallEntry(targetpackage, 'targetfunction', (1, 2),
+                                              {'spam': 'eggs', 'hello': 'world'})
+
+        assert_that(call_entry.matches_arguments_of(expected_call_entry), equal_to(True))
+
+    def test_should_not_match_arguments_of_call_entry_with_different_signature(self):
+
+        call_entry = FluentCallEntry(targetpackage, 'targetfunction', (1, 2), {})
+        expected_call_entry = FluentCallEntry(targetpackage, 'targetfunction', (1, 3), {})
+
+        assert_that(call_entry.matches_arguments_of(expected_call_entry), equal_to(False))
+
+    def test_should_not_match_arguments_of_call_entry_with_colliding_signature_hash(self):
+
+        call_entry = FluentCallEntry(targetpackage, 'targetfunction', (-1,), {})
+        expected_call_entry = FluentCallEntry(targetpackage, 'targetfunction', (-2,), {})
+
+        assert_that(call_entry.matches_arguments_of(expected_call_entry), equal_to(False))
+
+    def test_should_match_unhashable_arguments_of_call_entry(self):
+
+        call_entry = FluentCallEntry(targetpackage, 'targetfunction', ([1, 2],), {'spam': {'eggs': 1}})
+        expected_call_entry = FluentCallEntry(targetpackage, 'targetfunction', ([1, 2],), {'spam': {'eggs': 1}})
+
+        assert_that(call_entry.matches_arguments_of(expected_call_entry), equal_to(True))
+
+    def test_should_match_arguments_of_call_entry_containing_matchers(self):
+
+        call_entry = FluentCallEntry(targetpackage, 'targetfunction', (1, [2]), {'spam': True})
+        expected_call_entry = FluentCallEntry(targetpackage, 'targetfunction', (ANY_VALUE, ANY_LIST),
+                                              {'spam': ANY_BOOLEAN})
+
+        assert_that(call_entry.matches_arguments_of(expected_call_entry), equal_to(True))
+
+    def test_should_reuse_the_signature_of_a_recorded_call(self):
+
+        fluent_target = FluentTarget(targetpackage, 'targetfunction')
+        signature = ((1, 2), ())
+
+        call_entry = FluentCallEntry.of_resolved_target(fluent_target, (1, 2), {}, signature)
+
+        assert_that(call_entry._get_signature(), same_instance(signature))
+        assert_that(call_entry._has_matchers(), equal_to(False))
+
+
+class LongCallListVerificationTests(UnitTests):
+
+    def test_should_summarize_calls_beyond_the_maximum_number_of_listed_calls(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(123)
+
+        for number in range(1234):
+            targetpackage.targetfunction(number)
+
+        exception_raised = False
+        try:
+            verify(targetpackage, NEVER).targetfunction(ANY_VALUES)
+        except VerificationError as error:
+            exception_raised = True
+            message = str(error)
+            assert_that(message, ends_with("""
+          call targetpackage.targetfunction(99)
+          ... and 1134 more calls
+"""))
+
+        assert_that(exception_raised)
+
+    def test_should_keep_the_found_calls_of_the_failed_verification(self):
+
+        when(targetpackage).targetfunction(ANY_VALUES).then_return(123)
+
+        targetpackage.targetfunction(1)
+        targetpackage.targetfunction(2)
+
+        exception_raised = False
+        try:
+            verify(targetpackage, NEVER).targetfunction(ANY_VALUES)
+        except VerificationError as error:
+            exception_raised = True
+            assert_that(len(error.found_calls), equal_to(2))
+            assert_that(error.found_calls[1].arguments, equal_to((2,)))
+
+        assert_that(exception_raised)
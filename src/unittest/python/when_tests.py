@@ -13,13 +13,19 @@
 #   See the License for the specific language governing permissions and
 #   limitations under the License.
 
-from hamcrest import assert_that, equal_to, instance_of
+import sys
+import types
+
+from hamcrest import assert_that, equal_to, instance_of, same_instance
 from mock import Mock
 
-from fluentmock import ANY_VALUE, ANY_VALUES, FluentAnswer, FluentMockConfigurator, UnitTests, when
-from fluentmock.exceptions import InvalidAttributeError, InvalidUseOfAnyValuesError
+from fluentmock import (ANY_STRING, ANY_VALUE, ANY_VALUES, RECORD_COUNTS, RETAIN_DIGESTS, FluentAnswer,
+                        FluentMockConfigurator, FluentTarget, UnitTests, record_last, when)
+from fluentmock.exceptions import ConflictingOptionsError, InvalidAttributeError, InvalidUseOfAnyValuesError
+from fluentmock.matchers import contains
 
 import targetpackage
+import targetpackage.signatures
 import targetpackage.subpackage
 
 
@@ -406,3 +412,241 @@ class AnyArgumentTests(UnitTests):
         when(targetpackage.subpackage).subtargetfunction(1, ANY_VALUE, foo='bar', spam='egg').then_return('specific')
 
         assert_that(targetpackage.subpackage.subtargetfunction(1, 2, zap='bran', spam='blabla'), equal_to(None))
+
+    def test_should_match_argument_when_using_combined_matchers(self):
+
+        when(targetpackage).targetfunction(ANY_STRING & ~contains('eggs')).then_return('spam only')
+
+        assert_that(targetpackage.targetfunction('spam'), equal_to('spam only'))
+        assert_that(targetpackage.targetfunction('spam and eggs'), equal_to(None))
+        assert_that(targetpackage.targetfunction(1), equal_to(None))
+
+
+class AnswerPriorityTests(UnitTests):
+
+    def test_should_prefer_matcher_answer_when_configured_before_literal_answer(self):
+
+        when(targetpackage).targetfunction(ANY_VALUE).then_return('any')
+        when(targetpackage).targetfunction(1).then_return('one')
+
+        assert_that(targetpackage.targetfunction(1), equal_to('any'))
+
+    def test_should_prefer_literal_answer_when_configured_before_matcher_answer(self):
+
+        when(targetpackage).targetfunction(1).then_return('one')
+        when(targetpackage).targetfunction(ANY_VALUE).then_return('any')
+
+        assert_that(targetpackage.targetfunction(1), equal_to('one'))
+        assert_that(targetpackage.targetfunction(2), equal_to('any'))
+
+    def test_should_return_answers_of_many_literal_configurations(self):
+
+        for identifier in range(500):
+            when(targetpackage).targetfunction(identifier).then_return(identifier * 2)
+
+        assert_that(targetpackage.targetfunction(0), equal_to(0))
+        assert_that(targetpackage.targetfunction(321), equal_to(642))
+        assert_that(targetpackage.targetfunction(500), equal_to(None))
+
+    def test_should_return_answer_configured_with_unhashable_argument(self):
+
+        when(targetpackage).targetfunction([1, 2]).then_return('list')
+
+        assert_that(targetpackage.targetfunction([1, 2]), equal_to('list'))
+        assert_that(targetpackage.targetfunction([2, 1]), equal_to(None))
+
+    def test_should_move_replaced_answer_behind_answers_configured_in_between(self):
+
+        when(targetpackage).targetfunction(1).then_return('one')
+        when(targetpackage).targetfunction(ANY_VALUE).then_return('any')
+        when(targetpackage).targetfunction(1).then_return('replaced one')
+
+        assert_that(targetpackage.targetfunction(1), equal_to('any'))
+
+    def test_should_replace_answer_configured_with_the_same_matcher(self):
+
+        when(targetpackage).targetfunction(ANY_VALUE).then_return('first')
+        when(targetpackage).targetfunction(ANY_VALUE).then_return('second')
+
+        assert_that(targetpackage.targetfunction(1), equal_to('second'))
+
+    def test_should_replace_answer_configured_with_unhashable_argument(self):
+
+        when(targetpackage).targetfunction([1, 2]).then_return('first')
+        when(targetpackage).targetfunction([1, 2]).then_return('second')
+
+        assert_that(targetpackage.targetfunction([1, 2]), equal_to('second'))
+
+
+class ReturnEachTests(UnitTests):
+
+    def test_should_return_each_value_in_given_order(self):
+
+        when(targetpackage).targetfunction().then_return_each([1, 2, 3])
+
+        assert_that(targetpackage.targetfunction(), equal_to(1))
+        assert_that(targetpackage.targetfunction(), equal_to(2))
+        assert_that(targetpackage.targetfunction(), equal_to(3))
+
+    def test_should_repeat_last_value_when_all_values_have_been_returned(self):
+
+        when(targetpackage).targetfunction().then_return_each([1, 2])
+
+        targetpackage.targetfunction()
+        targetpackage.targetfunction()
+
+        assert_that(targetpackage.targetfunction(), equal_to(2))
+        assert_that(targetpackage.targetfunction(), equal_to(2))
+
+    def test_should_consume_values_lazily(self):
+
+        consumed = []
+
+        def values():
+            for value in range(3):
+                consumed.append(value)
+                yield value
+
+        when(targetpackage).targetfunction().then_return_each(values())
+
+        targetpackage.targetfunction()
+
+        assert_that(consumed, equal_to([0]))
+
+    def test_should_continue_with_next_answer_when_values_are_exhausted(self):
+
+        when(targetpackage).targetfunction().then_return(0).then_return_each([1, 2]).then_return(3)
+
+        assert_that(targetpackage.targetfunction(), equal_to(0))
+        assert_that(targetpackage.targetfunction(), equal_to(1))
+        assert_that(targetpackage.targetfunction(), equal_to(2))
+        assert_that(targetpackage.targetfunction(), equal_to(3))
+        assert_that(targetpackage.targetfunction(), equal_to(3))
+
+    def test_should_repeat_previous_answer_when_last_values_are_exhausted(self):
+
+        when(targetpackage).targetfunction().then_return(5).then_return_each([])
+
+        assert_that(targetpackage.targetfunction(), equal_to(5))
+        assert_that(targetpackage.targetfunction(), equal_to(5))
+        assert_that(targetpackage.targetfunction(), equal_to(5))
+
+    def test_should_repeat_last_value_when_last_values_are_exhausted_after_other_answer(self):
+
+        when(targetpackage).targetfunction().then_return(0).then_return_each([1, 2])
+
+        assert_that(targetpackage.targetfunction(), equal_to(0))
+        assert_that(targetpackage.targetfunction(), equal_to(1))
+        assert_that(targetpackage.targetfunction(), equal_to(2))
+        assert_that(targetpackage.targetfunction(), equal_to(2))
+
+    def test_should_answer_with_answer_added_after_values_are_exhausted(self):
+
+        answer = when(targetpackage).targetfunction().then_return_each([1])
+
+        assert_that(targetpackage.targetfunction(), equal_to(1))
+        assert_that(targetpackage.targetfunction(), equal_to(1))
+
+        answer.then_return(2)
+
+        assert_that(targetpackage.targetfunction(), equal_to(2))
+
+    def test_should_return_none_when_no_values_given(self):
+
+        when(targetpackage).targetfunction().then_return_each([])
+
+        assert_that(targetpackage.targetfunction(), equal_to(None))
+
+    def test_should_return_values_of_a_long_sequence(self):
+
+        answer = when(targetpackage).targetfunction()
+        for value in range(5000):
+            answer.then_return(value)
+
+        for value in range(5000):
+            assert_that(targetpackage.targetfunction(), equal_to(value))
+        assert_that(targetpackage.targetfunction(), equal_to(4999))
+
+
+class ResolvedTargetTests(UnitTests):
+
+    def test_should_resolve_module_given_as_string_to_the_same_module(self):
+
+        fluent_target = FluentTarget('targetpackage.subpackage', 'subtargetfunction')
+
+        assert_that(fluent_target.object, same_instance(targetpackage.subpackage))
+
+    def test_should_resolve_module_replaced_in_sys_modules_again(self):
+
+        FluentTarget('targetpackage.subpackage', 'subtargetfunction')
+        replacement = types.ModuleType('targetpackage.subpackage')
+        replacement.subtargetfunction = lambda: 'replaced'
+
+        original = sys.modules['targetpackage.subpackage']
+        sys.modules['targetpackage.subpackage'] = replacement
+        try:
+            fluent_target = FluentTarget('targetpackage.subpackage', 'subtargetfunction')
+        finally:
+            sys.modules['targetpackage.subpackage'] = original
+
+        assert_that(fluent_target.object, same_instance(replacement))
+
+    def test_should_resolve_module_given_as_other_module_object_of_same_name(self):
+
+        FluentTarget('targetpackage.subpackage', 'subtargetfunction')
+        replacement = types.ModuleType('targetpackage.subpackage')
+        replacement.subtargetfunction = lambda: 'replaced'
+
+        fluent_target = FluentTarget(replacement, 'subtargetfunction')
+
+        assert_that(fluent_target.object, same_instance(replacement))
+
+    def test_should_still_raise_exception_for_unknown_attribute_of_resolved_module(self):
+
+        FluentTarget('targetpackage', 'targetfunction')
+
+        self.assertRaises(InvalidAttributeError, FluentTarget, 'targetpackage', 'invalid_function')
+
+
+class WhenOptionsTests(UnitTests):
+
+    def test_should_raise_error_when_patched_attribute_is_configured_with_autospec(self):
+
+        when(targetpackage.signatures).compute(1).then_return(1)
+
+        exception_raised = False
+        try:
+            when(targetpackage.signatures, autospec=True).compute(2)
+        except ConflictingOptionsError as error:
+            exception_raised = True
+            assert_that(str(error), equal_to('The target "targetpackage.signatures.compute" has already been patched '
+                                             'with autospec False, it can not be configured with autospec True.'))
+
+        assert_that(exception_raised)
+
+    def test_should_raise_error_when_patched_attribute_is_configured_with_normalize(self):
+
+        when(targetpackage.signatures).compute(1).then_return(1)
+
+        self.assertRaises(ConflictingOptionsError, lambda: when(targetpackage.signatures, normalize=True).compute)
+
+    def test_should_raise_error_when_patched_attribute_is_configured_with_other_recording_policy(self):
+
+        when(targetpackage).targetfunction(1).then_return(1)
+
+        self.assertRaises(ConflictingOptionsError, lambda: when(targetpackage, recording=RECORD_COUNTS).targetfunction)
+
+    def test_should_raise_error_when_patched_attribute_is_configured_with_other_argument_retention(self):
+
+        when(targetpackage).targetfunction(1).then_return(1)
+
+        self.assertRaises(ConflictingOptionsError, lambda: when(targetpackage, retention=RETAIN_DIGESTS).targetfunction)
+
+    def test_should_accept_options_the_attribute_has_been_patched_with(self):
+
+        when(targetpackage.signatures, recording=record_last(10), autospec=True).compute(1).then_return(1)
+
+        when(targetpackage.signatures, recording=record_last(10), normalize=True).compute(2).then_return(2)
+        when(targetpackage.signatures).compute(3).then_return(3)
+
+        assert_that(targetpackage.signatures.compute(2), equal_to(2))